@@ -1,6 +1,7 @@
-from .core import EffectiveOperator, Completion
+from .core import EffectiveOperator, Completion, CompletionStats
 from .completions import (
     are_equivalent_completions,
+    remove_equivalent_completions,
     operator_completions,
     completions,
     clean_completions,
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+"""Resumable batch driver for completing the operators in `EFF_OPERATORS` and
+`DERIV_EFF_OPERATORS`.
+
+The work is split into units labelled by (operator, IBP-related operator,
+topology, colour structure) that are completed independently, possibly in a
+process pool. Each finished unit is written to its own file under
+``<output>/units/<operator>/``, and these files act as the checkpoint: units
+with a file are skipped when the batch is run again. Once every unit of an
+operator is done, the units are merged into the shard ``<output>/<operator>.dat``
+containing one `LazyCompletion` per line, the format read by
+`neutrinomass.database.ModelDatabase`.
+
+Example:
+    $ python -m neutrinomass.completions.batch --output raw_data --jobs 64
+
+"""
+
+import os
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple
+
+from neutrinomass.completions.core import EffectiveOperator, FailedCompletion
+from neutrinomass.completions.completions import (
+    iter_partitions,
+    prune_infeasible,
+    colour_structures,
+    partition_completion,
+    clean_completions,
+    derivative_combinations,
+)
+from neutrinomass.completions.topologies import get_topology_data
+from neutrinomass.completions.operators import EFF_OPERATORS, DERIV_EFF_OPERATORS
+from neutrinomass.database.export import export_completion, import_string
+
+OPERATORS = {**EFF_OPERATORS, **DERIV_EFF_OPERATORS}
+
+
+class WorkUnit(NamedTuple):
+    """The partitions of the ``variant``-th IBP-related form of ``operator`` on a
+    single topology and colour structure.
+
+    """
+
+    operator: str
+    variant: int
+    topology: int
+    colour_structure: int
+
+
+@lru_cache(maxsize=None)
+def operator_variants(name: str) -> List[EffectiveOperator]:
+    """Returns the operators that need to be completed for the operator labelled
+    ``name``: the operator itself, or for a derivative operator all of the ways
+    of acting the derivatives (see `deriv_operator_completions`).
+
+    """
+    op = OPERATORS[name]
+    if name not in DERIV_EFF_OPERATORS:
+        return [op]
+
+    return [c for c in derivative_combinations(op) if c.operator.simplify() != 0]
+
+
+def work_units(name: str) -> List[WorkUnit]:
+    """Returns all of the work units for the operator labelled ``name``."""
+    units = []
+    for variant, op in enumerate(operator_variants(name)):
+        n_topologies = len(get_topology_data(**op.topology_type))
+        n_colour = len(colour_structures(op))
+        for topology in range(n_topologies):
+            for colour_structure in range(n_colour):
+                units.append(WorkUnit(name, variant, topology, colour_structure))
+
+    return units
+
+
+def unit_path(output: str, unit: WorkUnit) -> str:
+    name = f"{unit.variant}_{unit.topology}_{unit.colour_structure}.dat"
+    return os.path.join(output, "units", unit.operator, name)
+
+
+def shard_path(output: str, name: str) -> str:
+    return os.path.join(output, f"{name}.dat")
+
+
+def write_lines(path: str, lines: Iterable[str]) -> None:
+    """Writes ``lines`` to ``path`` atomically, so that a file that exists is
+    always complete.
+
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        for line in lines:
+            f.write(line + "\n")
+
+    os.replace(tmp_path, path)
+
+
+def read_lines(path: str) -> List[str]:
+    with open(path, "r") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def complete_unit(unit: WorkUnit, output: str) -> int:
+    """Finds the completions of a work unit and writes them out. Returns the
+    number of completions written.
+
+    """
+    op = operator_variants(unit.operator)[unit.variant]
+    parts = iter_partitions(
+        op, topology=unit.topology, colour_structure=unit.colour_structure
+    )
+    parts = prune_infeasible(parts, Counter())
+
+    comps = []
+    for p in parts:
+        comp = partition_completion(p)
+        if not isinstance(comp, FailedCompletion):
+            comps.append(comp)
+
+    lines = [export_completion(c) for c in clean_completions(comps)]
+    write_lines(unit_path(output, unit), lines)
+    return len(lines)
+
+
+def merge_units(name: str, units: List[WorkUnit], output: str) -> int:
+    """Writes the shard for the operator labelled ``name`` from its unit files,
+    removing completions repeated across units with `clean_completions` so
+    that the shard matches a run over the whole operator. Returns the number
+    of completions in the shard.
+
+    """
+    comps, lines = [], {}
+    for unit in units:
+        for line in read_lines(unit_path(output, unit)):
+            comp = import_string(line).force()
+            lines[id(comp)] = line
+            comps.append(comp)
+
+    lines = [lines[id(comp)] for comp in clean_completions(comps)]
+    write_lines(shard_path(output, name), lines)
+    return len(lines)
+
+
+def run_batch(
+    names: List[str], output: str, jobs: int = 1, verbose=True
+) -> Dict[str, int]:
+    """Completes the operators labelled ``names`` and writes a shard for each into
+    the directory ``output``. Work already on disk is not redone. Returns a
+    dictionary mapping operator label to the number of completions in its
+    shard for those written in this call. Operators without topology data are
+    skipped.
+
+    """
+    units, pending = {}, []
+    for name in names:
+        if os.path.exists(shard_path(output, name)):
+            continue
+
+        try:
+            units[name] = work_units(name)
+        except FileNotFoundError as e:
+            # topologies missing for this operator, see `get_topology_data`
+            if verbose:
+                print(f"Skipping {name}: {e}")
+            continue
+
+        pending += [u for u in units[name] if not os.path.exists(unit_path(output, u))]
+
+    if verbose:
+        print(f"{len(units)} operators to complete, {len(pending)} work units pending.")
+
+    remaining = {name: 0 for name in units}
+    for unit in pending:
+        remaining[unit.operator] += 1
+
+    written = {}
+
+    def finish(name):
+        written[name] = merge_units(name, units[name], output)
+        if verbose:
+            print(f"{shard_path(output, name)} written!")
+
+    # operators with all units already on disk
+    for name, n in remaining.items():
+        if not n:
+            finish(name)
+
+    if jobs == 1:
+        for unit in pending:
+            complete_unit(unit, output)
+            remaining[unit.operator] -= 1
+            if not remaining[unit.operator]:
+                finish(unit.operator)
+
+        return written
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(complete_unit, u, output): u for u in pending}
+        for future in as_completed(futures):
+            unit = futures[future]
+            future.result()
+            remaining[unit.operator] -= 1
+            if not remaining[unit.operator]:
+                finish(unit.operator)
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("operators", nargs="*", help="labels (default: all)")
+    parser.add_argument("--output", type=str, default="raw_data")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    names = args.operators if args.operators else list(OPERATORS)
+    run_batch(names, args.output, jobs=args.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import os
+import pytest
+
+from neutrinomass.completions import batch
+from neutrinomass.completions.batch import *
+from neutrinomass.completions.completions import (
+    operator_completions,
+    clean_completions,
+    completion_key,
+)
+from neutrinomass.database.database import read_completions
+
+
+def test_run_batch(tmp_path, monkeypatch):
+    output = str(tmp_path)
+    written = run_batch(["1"], output, verbose=False)
+
+    comps = read_completions(shard_path(output, "1"))["1"]
+    assert written == {"1": len(comps)}
+    assert len(comps) == len(clean_completions(operator_completions(OPERATORS["1"])))
+
+    # resume from unit files without redoing any work
+    os.remove(shard_path(output, "1"))
+
+    def fail(unit, output):
+        raise AssertionError(f"{unit} completed twice")
+
+    monkeypatch.setattr(batch, "complete_unit", fail)
+    assert run_batch(["1"], output, verbose=False) == written
+    assert not run_batch(["1"], output, verbose=False)
+
+
+def test_work_units():
+    units = work_units("3b")
+    assert len(units) == len(set(units))
+    assert {u.topology for u in units} == {0, 1}
+
+
+def test_merge_units(tmp_path):
+    output = str(tmp_path)
+    # two colour structures on the same topology share completions
+    units = work_units("11a")[3:5]
+
+    comps = []
+    for unit in units:
+        complete_unit(unit, output)
+        op = operator_variants(unit.operator)[unit.variant]
+        parts = iter_partitions(
+            op, topology=unit.topology, colour_structure=unit.colour_structure
+        )
+        comps += [partition_completion(p) for p in parts]
+
+    comps = [c for c in comps if not isinstance(c, FailedCompletion)]
+    n_unit_lines = sum(len(read_lines(unit_path(output, u))) for u in units)
+    assert merge_units("11a", units, output) < n_unit_lines
+
+    key = lambda cs: sorted((completion_key(c), c.topology) for c in cs)
+    shard = [import_string(l).force() for l in read_lines(shard_path(output, "11a"))]
+    assert key(shard) == key(clean_completions(comps))
+
+
+def test_run_batch_missing_topologies(tmp_path, monkeypatch):
+    output = str(tmp_path)
+
+    def missing(name):
+        raise FileNotFoundError("Topologies not found")
+
+    monkeypatch.setattr(batch, "work_units", missing)
+    assert not run_batch(["1"], output, verbose=False)
+
+    # anything else is a bug and isn't skipped
+    def broken(name):
+        raise ValueError(name)
+
+    monkeypatch.setattr(batch, "work_units", broken)
+    with pytest.raises(ValueError):
+        run_batch(["1"], output, verbose=False)
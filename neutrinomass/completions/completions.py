@@ -4,6 +4,7 @@
 
 from neutrinomass.tensormethod.core import (
     Index,
+    IndexAllocator,
     Field,
     IndexedField,
     eps,
@@ -12,6 +13,8 @@ from neutrinomass.tensormethod.core import (
     Operator,
     get_dynkin,
     D,
+    current_index_allocator,
+    index_scope,
 )
 from neutrinomass.tensormethod.contract import (
     lorentz_singlets,
@@ -20,18 +23,18 @@ from neutrinomass.tensormethod.contract import (
     contract_su2,
 )
 
-from neutrinomass.utils import timeit
+from neutrinomass.utils import timeit, stage_timer, stage_times
 from neutrinomass.tensormethod.utils import safe_nocoeff
 from neutrinomass.completions.utils import (
     flatten,
     chunks,
-    factors,
     multiple_replace,
     allowed_lor_dyn,
 )
 from neutrinomass.utils.functions import remove_equivalent, remove_equivalent_nopop
 from neutrinomass.completions.core import (
     Completion,
+    CompletionStats,
     Model,
     FailedCompletion,
     EffectiveOperator,
@@ -41,23 +44,31 @@ from neutrinomass.completions.core import (
     MajoranaFermion,
     ComplexScalar,
     RealScalar,
+    failure_category,
+)
+from neutrinomass.completions.topologies import (
+    get_topology_data,
+    leaf_automorphisms,
+    Leaf,
+    PartitionGraph,
 )
-from neutrinomass.completions.topologies import get_topology_data, Leaf
 from neutrinomass.utils import pmatch
 from neutrinomass.utils.functions import stringify_qns, conjugate_term
 
-from typing import Tuple, List, Dict, Union
+from typing import Tuple, List, Dict, Union, Iterator, Iterable
 import networkx as nx
 import networkx.algorithms.isomorphism as iso
 from copy import copy, deepcopy
 from alive_progress import alive_bar
+from concurrent.futures import ProcessPoolExecutor
 
-from collections import Counter, defaultdict
-from itertools import permutations, groupby, combinations
+from collections import Counter, defaultdict, deque
+from itertools import permutations, groupby, combinations, islice, product
 from sympy.tensor.tensor import Tensor
-from sympy import prime
+from sympy.utilities.iterables import multiset_permutations
 
 from functools import lru_cache, reduce
+from math import factorial
 import re
 import os
 
@@ -118,15 +129,171 @@ def distribute_fields(fields, partition):
     """Takes the fields and puts them in place of the strings in the partition
     template in every possible way.
 
-        >>> distribute_fields([H('i0_'), H('i1_'), L('u0_ i2_'), L('u1_ i3_')], (('F', 18), ('S', 162), (('F', 6), ('S', 54))))
+        >>> list(distribute_fields([H('i0_'), H('i1_'), L('u0_ i2_'), L('u1_ i3_')], (('F', 18), ('S', 162), (('F', 6), ('S', 54)))))
         [((L(u0_, i2_), 18), (H(i0_), 162), ...), ((L(u1_, i3_), 18), (H(i0_), 162), ...), ...]
 
-    Returns lots of double ups.
+    Lazily yields each placement once, but works through all of the
+    permutations of ``fields`` to do so.
+
+    """
+    seen = set()
+    for perm in permutations(fields):
+        part = replace_fields(perm, partition)
+        if part not in seen:
+            seen.add(part)
+            yield part
+
+
+def equivalence_classes(fields_and_counters: Dict[IndexedField, int]) -> List[int]:
+    """Returns a list of integers, one for each field in ``fields_and_counters``,
+    that are equal for fields interchangeable under relabelling according to
+    the counters of `indexed_fields_with_counters`.
 
     """
-    perms = permutations(fields)
-    parts = [replace_fields(fields, partition) for fields in perms]
-    return quick_remove_equivalent_partitions(parts)
+    classes = {}
+    for field, counter in fields_and_counters.items():
+        classes.setdefault((field.label, counter), len(classes))
+
+    return [classes[(f.label, i)] for f, i in fields_and_counters.items()]
+
+
+def _multiset_permutations(items: list) -> Iterator[list]:
+    # sympy's version doesn't handle the empty multiset
+    if not items:
+        yield []
+        return
+
+    yield from multiset_permutations(items)
+
+
+def is_canonical_placement(classes: list, automorphisms: List[tuple]) -> bool:
+    """Checks whether the assignment of equivalence ``classes`` to leaf positions
+    is the lexicographically smallest in its orbit under ``automorphisms`` (see
+    `leaf_automorphisms`).
+
+    """
+    for perm in automorphisms:
+        image = [None] * len(classes)
+        for i, cls in enumerate(classes):
+            image[perm[i]] = cls
+
+        if image < classes:
+            return False
+
+    return True
+
+
+def distinct_placements(
+    fields_and_counters: Dict[IndexedField, int], partition, automorphisms=None
+) -> Iterator[tuple]:
+    """Like `distribute_fields` but yields each distinct assignment of fields to
+    the leaves of the partition template exactly once, treating fields in the
+    same equivalence class (see `equivalence_classes`) as identical.
+
+    The cost scales with the number of distinct placements (a multinomial
+    coefficient) rather than the factorial of the number of fields. Since
+    scalars and fermions fill different leaves, they are permuted separately.
+
+    If the ``automorphisms`` of the topology are given, only one placement
+    from each orbit is yielded, since the others lead to isomorphic diagrams.
+
+    """
+    fields = list(fields_and_counters)
+    classes = equivalence_classes(fields_and_counters)
+
+    by_class = defaultdict(list)
+    scalar_classes, fermion_classes = [], []
+    for field, cls in zip(fields, classes):
+        by_class[cls].append(field)
+        if field.is_boson:
+            scalar_classes.append(cls)
+        else:
+            fermion_classes.append(cls)
+
+    def fields_from_classes(class_perm):
+        queues = {k: iter(v) for k, v in by_class.items()}
+        return [next(queues[cls]) for cls in class_perm]
+
+    for scalar_perm in _multiset_permutations(scalar_classes):
+        scalars = fields_from_classes(scalar_perm)
+        for fermion_perm in _multiset_permutations(fermion_classes):
+            if automorphisms is not None and not is_canonical_placement(
+                scalar_perm + fermion_perm, automorphisms
+            ):
+                continue
+
+            fermions = fields_from_classes(fermion_perm)
+            yield replace_fields(scalars + fermions, partition)
+
+
+def n_distinct_placements(
+    fields_and_counters: Dict[IndexedField, int], automorphisms=None
+) -> int:
+    """Returns the number of placements yielded by `distinct_placements`. With
+    ``automorphisms`` the orbits are counted with Burnside's lemma.
+
+    """
+    classes = equivalence_classes(fields_and_counters)
+    if automorphisms is not None:
+        n_fixed = [
+            _n_fixed_placements(fields_and_counters, classes, perm)
+            for perm in automorphisms
+        ]
+        return sum(n_fixed) // len(automorphisms)
+
+    out = 1
+    for is_boson in (True, False):
+        counts = Counter(
+            cls
+            for f, cls in zip(fields_and_counters, classes)
+            if f.is_boson == is_boson
+        )
+        out *= factorial(sum(counts.values()))
+        for n in counts.values():
+            out //= factorial(n)
+
+    return out
+
+
+def _n_fixed_placements(
+    fields_and_counters: Dict[IndexedField, int], classes: List[int], perm: tuple
+) -> int:
+    # The number of placements unchanged by the leaf permutation ``perm``:
+    # those constant on each of its cycles.
+    is_boson = [f.is_boson for f in fields_and_counters]
+    n_scalars = sum(is_boson)
+    class_is_boson = {cls: b for cls, b in zip(classes, is_boson)}
+    counts = Counter(classes)
+    keys = list(counts)
+
+    cycles, seen = [], set()
+    for start in range(len(perm)):
+        if start in seen:
+            continue
+
+        length, i = 0, start
+        while i not in seen:
+            seen.add(i)
+            i = perm[i]
+            length += 1
+
+        cycles.append((length, start < n_scalars))
+
+    @lru_cache(maxsize=None)
+    def ways(i, remaining):
+        if i == len(cycles):
+            return int(not any(remaining))
+
+        length, boson = cycles[i]
+        out = 0
+        for j, n in enumerate(remaining):
+            if n >= length and class_is_boson[keys[j]] == boson:
+                new_remaining = remaining[:j] + (n - length,) + remaining[j + 1 :]
+                out += ways(i + 1, new_remaining)
+
+        return out
+
+    return ways(0, tuple(counts[k] for k in keys))
 
 
 def node_dictionary(
@@ -149,19 +316,20 @@ def node_dictionary(
 
 def set_external_fields(
     partition: tuple, graph: nx.Graph, field_dict: Dict[IndexedField, int]
-) -> nx.Graph:
-    """Add indexed fields as edge attributes on graph through side effect."""
-    g = deepcopy(graph)
+) -> PartitionGraph:
+    """Returns the topology ``graph`` overlaid with the indexed fields as edge
+    attributes. The graph itself is shared, not copied.
+
+    """
     node_attrs = node_dictionary(partition, field_dict)
 
     edge_attrs = {}
-    for edge in graph.edges:
-        for n, field_dict in node_attrs.items():
-            if n in edge:
-                edge_attrs[edge] = field_dict
+    for n, attrs in node_attrs.items():
+        # external nodes are leaves
+        (neighbour,) = graph.neighbors(n)
+        edge_attrs[(n, neighbour)] = attrs
 
-    nx.set_edge_attributes(g, edge_attrs)
-    return g
+    return PartitionGraph(graph, edge_attrs)
 
 
 def indexed_fields_with_counters(op: Operator) -> Dict[IndexedField, int]:
@@ -204,21 +372,29 @@ def indexed_fields_with_counters(op: Operator) -> Dict[IndexedField, int]:
     return dict(flat)
 
 
-def partitions(operator: EffectiveOperator, verbose=False) -> List[dict]:
-    """Returns a list of operator partitions, epsilons and graphs of the form:
+def colour_structures(operator: EffectiveOperator) -> List[EffectiveOperator]:
+    """Returns the operator with its colour indices contracted in every way
+    considered when finding completions.
 
-    {"fields": ((L(u0, I_0), 18), ...)
-    "epsilons": (...),
-    "graph": ...}
+    """
+    colour_ops = colour_singlets([operator.operator], overcomplete=True)
+    return [EffectiveOperator(operator.name, op) for op in colour_ops]
 
-    from the partitions of the fields in the operator. This is all of the
-    information required to find the completion.
+
+def iter_partitions(
+    operator: EffectiveOperator, verbose=False, topology=None, colour_structure=None
+) -> Iterator[dict]:
+    """Lazy version of `partitions`: yields the operator partitions one at a
+    time so that memory use does not grow with the number of partitions.
 
     """
     topology_data_list = get_topology_data(**operator.topology_type)
+    if topology is not None:
+        topology_data_list = [topology_data_list[topology]]
 
-    colour_ops = colour_singlets([operator.operator], overcomplete=True)
-    colour_ops = [EffectiveOperator(operator.name, op) for op in colour_ops]
+    colour_ops = colour_structures(operator)
+    if colour_structure is not None:
+        colour_ops = [colour_ops[colour_structure]]
 
     if verbose:
         print(
@@ -227,51 +403,97 @@ def partitions(operator: EffectiveOperator, verbose=False) -> List[dict]:
             + f"{len(topology_data_list)} relevant topologies."
         )
 
-    out = []
+    # return counters as well for isomorphism filtering
+    fields_and_counters = indexed_fields_with_counters(operator.operator)
+
     counter = 1
     for topology_data in topology_data_list:
         if verbose:
             print(f"Furnishing topology {counter}...")
             counter += 1
 
-        # return counters as well for isomorphism filtering
-        fields_and_counters = indexed_fields_with_counters(operator.operator)
-        fields = [f for f, i in fields_and_counters.items()]
-        perms = distribute_fields(fields, topology_data["partition"])
+        partition_file = topology_data["partition_file"]
+        partition_filename = os.path.basename(partition_file)
+        topology_classification = os.path.splitext(partition_filename)[0]
+
         for op in colour_ops:
-            # col_out = []
             epsilons = op.operator.epsilons
 
-            for perm in perms:
+            placements = distinct_placements(
+                fields_and_counters,
+                topology_data["partition"],
+                automorphisms=leaf_automorphisms(partition_file),
+            )
+            for perm in placements:
                 g = topology_data["graph"]
                 g = set_external_fields(perm, g, fields_and_counters)
 
-                partition_file = topology_data["partition_file"]
-                topology_classification = os.path.splitext(
-                    os.path.basename(partition_file)
-                )[0]
-
-                data = {
+                yield {
                     "operator": op,
                     "partition": perm,
                     "epsilons": epsilons,
                     "graph": g,
                     "topology": topology_classification,
                 }
-                out.append(data)
 
-            # if remove_isomorphic_diagrams:
-            #     col_out = remove_isomorphic(col_out)
 
-            # out += col_out
+def estimate_partitions(
+    operator: EffectiveOperator, topology=None, colour_structure=None
+) -> int:
+    """Returns the number of partitions `iter_partitions` will yield without
+    generating them, e.g. for progress bars.
 
-    return out
+    """
+    topology_data_list = get_topology_data(**operator.topology_type)
+    if topology is not None:
+        topology_data_list = [topology_data_list[topology]]
+
+    n_colour = len(colour_structures(operator))
+    if colour_structure is not None:
+        n_colour = 1
+
+    fields_and_counters = indexed_fields_with_counters(operator.operator)
+    n_placements = 0
+    for topology_data in topology_data_list:
+        automorphisms = leaf_automorphisms(topology_data["partition_file"])
+        n_placements += n_distinct_placements(fields_and_counters, automorphisms)
+
+    return n_colour * n_placements
+
+
+def partitions(
+    operator: EffectiveOperator, verbose=False, topology=None, colour_structure=None
+) -> List[dict]:
+    """Returns a list of operator partitions, epsilons and graphs of the form:
+
+    {"fields": ((L(u0, I_0), 18), ...)
+    "epsilons": (...),
+    "graph": ...}
+
+    from the partitions of the fields in the operator. This is all of the
+    information required to find the completion.
+
+    The optional integers ``topology`` and ``colour_structure`` restrict the
+    output to the partitions of a single topology (position in
+    `get_topology_data`) or colour structure (position in `colour_singlets`).
+
+    For large operators prefer the generator `iter_partitions`.
+
+    """
+    return list(
+        iter_partitions(
+            operator,
+            verbose=verbose,
+            topology=topology,
+            colour_structure=colour_structure,
+        )
+    )
 
 
 def are_equivalent_partitions(a, b):
     """Checks for partition equivalence by checking if the graphs are isomorphic."""
-    ga = a["graph"]
-    gb = b["graph"]
+    ga = a["graph"].to_networkx()
+    gb = b["graph"].to_networkx()
 
     if not iso.faster_could_be_isomorphic(ga, gb):
         return False
@@ -281,17 +503,51 @@ def are_equivalent_partitions(a, b):
 
 
 def graph_fingerprint(part):
-    g = part["graph"]
+    g = part["graph"].topology
     degree = dict(g.degree())
     return sorted(degree.values())
 
 
+def graph_hash(part) -> str:
+    """Returns a Weisfeiler-Lehman hash of the edge-labelled graph of the
+    partition. Partitions with isomorphic graphs have the same hash, although
+    the converse need not hold.
+
+    """
+    g = nx.Graph()
+    for u, v, data in part["graph"].labelled_edges():
+        # labels can contain daggers, but networkx hashes ascii
+        g.add_edge(u, v, particle=ascii(data.get("particle", "exotic")))
+
+    return nx.weisfeiler_lehman_graph_hash(g, edge_attr="particle")
+
+
+def iter_remove_isomorphic(partitions: Iterable[dict]) -> Iterator[dict]:
+    """Lazy version of `remove_isomorphic`.
+
+    Partitions are bucketed by their epsilons and `graph_hash` in a single pass,
+    and `are_equivalent_partitions` is only called on partitions in the same
+    bucket. The epsilons are included so that different colour structures on
+    the same diagram are kept.
+
+    """
+    buckets = defaultdict(list)
+    for part in partitions:
+        epsilons = tuple(sorted(map(str, part["epsilons"])))
+        bucket = buckets[(epsilons, graph_hash(part))]
+        if any(are_equivalent_partitions(part, other) for other in bucket):
+            continue
+
+        bucket.append(part)
+        yield part
+
+
 def remove_isomorphic(partitions: List[dict]) -> List[dict]:
     """Same algorithm as removeIsomorphic in ``wolfram/`` directory. Remove
-    isomorphic graphs (by side effect) to reduce double-ups of completions.
+    isomorphic graphs to reduce double-ups of completions.
 
     """
-    return remove_equivalent_nopop(partitions, are_equivalent_partitions)
+    return list(iter_remove_isomorphic(partitions))
 
 
 # The approach to finding the completions is the following: contract off fields
@@ -463,6 +719,83 @@ def check_singlet(operator: Operator, ignore=["3b"]) -> None:
         assert free.index_type == "Generation"
 
 
+def _are_identical_fields(a: IndexedField, b: IndexedField) -> bool:
+    return (
+        type(a) is type(b)
+        and a.label == b.label
+        and a.dynkin == b.dynkin
+        and a.derivs == b.derivs
+        and a.charges == b.charges
+    )
+
+
+def vanishes_by_symmetry(term: Operator) -> bool:
+    """Fast combinatorial check for the common way a term vanishes: two identical
+    fields whose indices are contracted pairwise into antisymmetric epsilons.
+
+    Exchanging the fields gives a sign from their statistics and a sign from
+    each epsilon whose indices swap. If the product of the signs is negative,
+    the term is equal to minus itself. Returns True if the term vanishes this
+    way, and False if it can't tell, in which case `is_vanishing` falls back on
+    sympy.
+
+    """
+    if not isinstance(term, Operator):
+        return False
+
+    tensors = term.tensors
+    # position of each antisymmetric epsilon and the indices it contracts
+    epsilon_of = {}
+    for n, t in enumerate(tensors):
+        if isinstance(t, IndexedField) or str(t).startswith("KD"):
+            continue
+        for idx in t.indices:
+            if not idx.is_up:
+                epsilon_of[idx.name] = n
+
+    fields = [(n, t) for n, t in enumerate(tensors) if isinstance(t, IndexedField)]
+    for (_, a), (_, b) in combinations(fields, 2):
+        if not _are_identical_fields(a, b):
+            continue
+
+        # pair each index of a with an index of b on the same epsilon
+        b_indices = {idx.name: idx for idx in b.indices}
+        n_pairs = 0
+        for idx in a.indices:
+            eps_position = epsilon_of.get(idx.name)
+            if not idx.is_up or eps_position is None:
+                break
+
+            partners = [
+                i.name
+                for i in tensors[eps_position].indices
+                if i.name in b_indices and i.index_type == idx.index_type
+            ]
+            if len(partners) != 1:
+                break
+
+            del b_indices[partners[0]]
+            n_pairs += 1
+        else:
+            statistics_sign = -1 if a.is_fermion else 1
+            if not b_indices and statistics_sign * (-1) ** n_pairs == -1:
+                return True
+
+    return False
+
+
+def is_vanishing(term: Operator) -> bool:
+    """Checks whether ``term`` vanishes, only running sympy's (expensive)
+    `safe_simplify` if `vanishes_by_symmetry` can't decide.
+
+    """
+    if vanishes_by_symmetry(term):
+        return True
+
+    return term.safe_simplify() == 0
+
+
+@stage_timer("exotic_field_and_term")
 def exotic_field_and_term(
     op: Operator, symbols: Dict[str, List[str]], field_dict: Dict[tuple, str]
 ) -> Tuple[IndexedField, IndexedField, Union[Operator, str]]:
@@ -550,7 +883,7 @@ def exotic_field_and_term(
     # check first whether there are any doubled up fields in the term and only
     # run on those
     set_fields = set([f.label for f in term.fields])
-    if len(set_fields) < len(term.fields) and term.safe_simplify() == 0:
+    if len(set_fields) < len(term.fields) and is_vanishing(term):
         return exotic_field, partner, f"Vanishing coupling at {term}"
 
     # need to construct term again because sympy is annoying
@@ -561,6 +894,7 @@ def exotic_field_and_term(
     return exotic_field, partner, term
 
 
+@stage_timer("process_derivative_term")
 def process_derivative_term(op: Operator) -> Union[Operator, str]:
     """Process term containing derivatives, return corresponding term that would
     appear in the Lagrangian.
@@ -610,7 +944,7 @@ def process_derivative_term(op: Operator) -> Union[Operator, str]:
     # cases 1 and 2
     if len(scalars) > 2:
         term = reduce(lambda x, y: x * y, scalars + epsilons)
-        if term.safe_simplify() == 0:
+        if is_vanishing(term):
             return "Vanishing structure"
         return term
     # case 6
@@ -649,6 +983,42 @@ def process_derivative_term(op: Operator) -> Union[Operator, str]:
     return right * left * eps(index_str)
 
 
+# Results of `contract` keyed by `contraction_key`. Cleared when full.
+_CONTRACTION_CACHE = {}
+CONTRACTION_CACHE_SIZE = 100_000
+
+
+def contraction_key(
+    fields: Tuple[IndexedField],
+    symbols: Dict[str, List[str]],
+    gauge_epsilons: list,
+    field_dict: Dict[tuple, str],
+) -> tuple:
+    """Returns a key describing everything the result of `contract` depends on:
+    the fields with their indices and quantum numbers, the gauge epsilons and
+    the symbol the exotic field would be given.
+
+    The partitions of an operator all share the operator's indexed fields, so
+    the same contraction at a vertex in different partitions and topologies
+    has the same key.
+
+    """
+    from neutrinomass.database.export import export_tensor
+
+    fs = tuple(sorted([f.field for f in fields], key=lambda x: x.label_with_dagger))
+    return (
+        tuple(export_tensor(f) for f in fields),
+        tuple(export_tensor(e) for e in gauge_epsilons),
+        tuple(v[0] if v else None for v in symbols.values()),
+        field_dict.get(fs),
+    )
+
+
+def clear_contraction_cache() -> None:
+    _CONTRACTION_CACHE.clear()
+
+
+@stage_timer("contract")
 def contract(
     fields: Tuple[IndexedField],
     symbols: Dict[str, List[str]],
@@ -677,6 +1047,46 @@ def contract(
         1
 
     """
+    # the fresh indices of the result depend on the state of the allocator
+    indices = current_index_allocator()
+    key = contraction_key(fields, symbols, gauge_epsilons, field_dict), indices.state
+    if key in _CONTRACTION_CACHE:
+        popped, result, indices.state = _CONTRACTION_CACHE[key]
+    else:
+        n_symbols = {k: len(v) for k, v in symbols.items()}
+        result = _contract(fields, symbols, gauge_epsilons, field_dict)
+
+        # record the symbol taken from `symbols` to replay it on a hit
+        popped = None
+        for k, v in symbols.items():
+            if len(v) < n_symbols[k]:
+                popped = k
+
+        if len(_CONTRACTION_CACHE) >= CONTRACTION_CACHE_SIZE:
+            _CONTRACTION_CACHE.clear()
+        _CONTRACTION_CACHE[key] = popped, result, indices.state
+
+        return result
+
+    if popped is not None:
+        fs = tuple(sorted([f.field for f in fields], key=lambda x: x.label_with_dagger))
+        field_dict[fs] = symbols[popped].pop(0)
+
+    if isinstance(result, str):
+        return result
+
+    # the lists are mutated downstream
+    exotic, term, spectator_gauge_eps, lorentz_epsilons = result
+    return exotic, term, list(spectator_gauge_eps), list(lorentz_epsilons)
+
+
+def _contract(
+    fields: Tuple[IndexedField],
+    symbols: Dict[str, List[str]],
+    gauge_epsilons: list,
+    field_dict: Dict[tuple, str],
+) -> Union[Tuple[FieldType, Operator, List[Tensor], List[Tensor]], str]:
+    # The uncached version of `contract`
     if len(fields) != 2 and len(fields) != 3:
         raise Exception("Too many fields passed to contract.")
 
@@ -720,7 +1130,7 @@ def contract(
         if isinstance(no_deriv_maybe_term, str):
             return no_deriv_maybe_term
 
-        if no_deriv_maybe_term.safe_simplify() == 0:
+        if is_vanishing(no_deriv_maybe_term):
             return f"Vanishing coupling at {maybe_term} after derivative processing."
 
     check_singlet(no_deriv_maybe_term)
@@ -840,11 +1250,140 @@ def reduced_row(row, func):
     return func(tuple(map(lambda a: reduced_row(a, func), row)))
 
 
-def construct_completion(partition, gauge_epsilons, graph) -> Union[str, tuple]:
+def lorentz_contraction(irreps: List[Tuple[int, int, int]]) -> Union[tuple, str, None]:
+    """Integer version of `get_lorentz_epsilons`. Takes the number of undotted
+    and dotted indices and derivatives of each field at a vertex, and returns
+    the number of undotted and dotted indices left on the exotic field, or
+    the reason the contraction fails. Returns None if the case isn't covered.
+
+    """
+    n_derivs = sum(derivs for _, _, derivs in irreps)
+    if n_derivs > 2:
+        return None
+
+    n_undotted = sum(u for u, _, _ in irreps)
+    n_dotted = sum(d for _, d, _ in irreps)
+    if not n_derivs and len(irreps) == 4:
+        return n_undotted, n_dotted
+
+    if not n_derivs and len(irreps) == 3:
+        bosons = [(u, d) for u, d, _ in irreps if (u + d) % 2 == 0]
+        if len(bosons) == 3:
+            return n_undotted, n_dotted
+
+        if not bosons:
+            return "Bad Lorentz contraction."
+
+        if len(bosons) != 1:
+            return None
+
+        (scalar_u, scalar_d), *_ = bosons
+        n_undotted, n_dotted = n_undotted - scalar_u, n_dotted - scalar_d
+
+    # reject vector contraction
+    if n_undotted == 1 and n_dotted == 1:
+        return "Bad Lorentz contraction."
+
+    return n_undotted % 2, n_dotted % 2
+
+
+def infeasible_reason(partition) -> Union[str, None]:
+    """Integer-only pre-pass over the partition tree before any sympy objects are
+    built. Follows the Lorentz structure of the exotic fields through the
+    contractions in `construct_completion` from the dynkin labels of the
+    fields alone. Returns the reason the partition cannot be completed, or
+    None if it may be.
+
+    The SU(2) and SU(3) indices and the charges never make a vertex impossible
+    on their own, since the exotic field takes whatever is left over.
+
+    """
+
+    def reduce_row(row):
+        if isinstance(row, Leaf):
+            u, d, *_ = row.field.dynkin_ints
+            return u, d, row.field.derivs
+
+        irreps = []
+        for item in row:
+            irrep = reduce_row(item)
+            if not isinstance(irrep, tuple):
+                return irrep
+            irreps.append(irrep)
+
+        if len(irreps) == 1:
+            return irreps[0]
+
+        leftover = lorentz_contraction(irreps)
+        if not isinstance(leftover, tuple):
+            return leftover
+
+        # exotic fields carry no derivatives
+        return (*leftover, 0)
+
+    irreps = []
+    for row in partition:
+        irrep = reduce_row(row)
+        if not isinstance(irrep, tuple):
+            return irrep
+        irreps.append(irrep)
+
+    maybe_reason = lorentz_contraction(irreps)
+    return maybe_reason if isinstance(maybe_reason, str) else None
+
+
+def prune_infeasible(partitions: Iterable[dict], pruned: Counter) -> Iterator[dict]:
+    """Yields the partitions passing `infeasible_reason`, counting the reasons
+    for those that don't in ``pruned`` by `failure_category`.
+
+    """
+    for part in partitions:
+        reason = infeasible_reason(part["partition"])
+        if reason is not None:
+            pruned[failure_category(reason)] += 1
+            continue
+
+        yield part
+
+
+def partition_index_allocator(partition, gauge_epsilons) -> IndexAllocator:
+    """Returns an allocator for the fresh indices of the completion of
+    ``partition``, carrying on from the indices of the operator. The same
+    partition then gets the same index labels in any process.
+
+    """
+    indices = []
+    for leaf in flatten(partition):
+        if isinstance(leaf, IndexedField):
+            indices += leaf.get_indices()
+
+    for epsilon in gauge_epsilons:
+        indices += epsilon.get_indices()
+
+    return IndexAllocator.after(indices)
+
+
+def construct_completion(
+    partition, gauge_epsilons, graph, indices: IndexAllocator = None
+) -> Union[str, tuple]:
     """Returns arguments needed to pass into Completion object contructor, or a
     string with the reason the completion failed.
 
+    Fresh indices are taken from ``indices``, by default the allocator from
+    `partition_index_allocator`.
+
+    Partitions rejected by `infeasible_reason` fail here as well, but more
+    slowly, so pipelines run `prune_infeasible` first.
+
     """
+    if indices is None:
+        indices = partition_index_allocator(partition, gauge_epsilons)
+
+    with index_scope(indices):
+        return _construct_completion(partition, gauge_epsilons, graph)
+
+
+def _construct_completion(partition, gauge_epsilons, graph) -> Union[str, tuple]:
     lorentz_epsilons, terms, edge_dict, field_dict = [], [], {}, {}
     more_fermion_symbols = ["f" + str(i) for i in range(10)]
     more_scalar_symbols = ["S" + str(i) for i in range(10)]
@@ -908,7 +1447,7 @@ def construct_completion(partition, gauge_epsilons, graph) -> Union[str, tuple]:
         if isinstance(proc_term, str):
             return proc_term
 
-        if proc_term.safe_simplify() == 0:
+        if is_vanishing(proc_term):
             return f"Vanishing coupling at {maybe_term} after derivative processing."
 
     # make sure the term is a singlet
@@ -920,6 +1459,7 @@ def construct_completion(partition, gauge_epsilons, graph) -> Union[str, tuple]:
     return terms, edge_dict, field_dict, lorentz_epsilons
 
 
+@stage_timer("partition_completion")
 def partition_completion(partition) -> Union[Completion, FailedCompletion]:
     """Return the completion object associated with a partition."""
     part = partition["partition"]
@@ -940,7 +1480,7 @@ def partition_completion(partition) -> Union[Completion, FailedCompletion]:
     eff_operator = EffectiveOperator(op.name, explicit_op)
 
     new_edge_attrs = {v: {"particle": k.label} for k, v in edge_dict.items()}
-    nx.set_edge_attributes(graph, new_edge_attrs)
+    graph = graph.with_edge_attrs(new_edge_attrs).to_networkx()
 
     return Completion(
         operator=eff_operator,
@@ -952,38 +1492,221 @@ def partition_completion(partition) -> Union[Completion, FailedCompletion]:
     )
 
 
+def _complete_exported_partitions(
+    exported_parts: List[Dict[str, str]]
+) -> Tuple[List[Union[str, FailedCompletion]], Dict[str, float]]:
+    """Worker function for `parallel_partition_completions`.
+
+    Partitions come in and completions go out in the string form of
+    ``neutrinomass.database.export``, since pickling the sympy objects directly
+    loses the state set in their constructors. The times spent in each stage
+    are returned alongside.
+
+    """
+    from neutrinomass.database.export import (
+        import_partition_data,
+        export_completion,
+    )
+
+    out = []
+    with stage_times() as times:
+        for exported in exported_parts:
+            comp = partition_completion(import_partition_data(exported))
+            if not isinstance(comp, FailedCompletion):
+                comp = export_completion(comp, lazy=False)
+            out.append(comp)
+
+    return out, times
+
+
+def parallel_partition_completions(
+    parts, jobs=None, executor=None, chunksize=32, stats=None
+) -> Iterator[Union[Completion, FailedCompletion]]:
+    """Yields `partition_completion` of every partition in ``parts``, in order,
+    with the work done in a process pool.
+
+    Partitions are sent to the pool ``chunksize`` at a time and only a couple
+    of chunks per worker are in flight at once, so ``parts`` can be a lazy
+    iterable. An existing ``executor`` can be passed in, otherwise one is
+    created with ``jobs`` workers and shut down at the end. The stage times of
+    the workers are added to ``stats`` if passed in.
+
+    """
+    from neutrinomass.database.export import export_partition_data, import_completion
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+
+    max_in_flight = 2 * (jobs or os.cpu_count() or 1)
+    parts = iter(parts)
+    in_flight = deque()
+    try:
+        while True:
+            while len(in_flight) < max_in_flight:
+                chunk = [export_partition_data(p) for p in islice(parts, chunksize)]
+                if not chunk:
+                    break
+                in_flight.append(
+                    (len(chunk), executor.submit(_complete_exported_partitions, chunk))
+                )
+
+            if not in_flight:
+                return
+
+            _, future = in_flight.popleft()
+            comps, times = future.result()
+            if stats is not None:
+                stats.add_times(times)
+
+            for comp in comps:
+                if isinstance(comp, str):
+                    comp = import_completion(comp)
+                yield comp
+    finally:
+        for _, future in in_flight:
+            future.cancel()
+        if own_executor:
+            executor.shutdown()
+
+
+def operator_partitions(
+    operator: EffectiveOperator,
+    stats: CompletionStats,
+    verbose=False,
+    remove_isomorphic_diagrams=False,
+) -> Iterator[dict]:
+    """Yields the partitions of the operator left to complete, counting the ones
+    generated and pruned in ``stats``.
+
+    The isomorphism filter `iter_remove_isomorphic` is safe to run but off by
+    default. `iter_partitions` already skips the placements related by
+    automorphisms of the topology, so the filter finds no isomorphic partitions
+    among those left, while it costs time and keeps every distinct partition in
+    memory. Pass ``remove_isomorphic_diagrams`` to run it anyway, e.g. as a
+    check on the automorphism pruning.
+
+    """
+    n_generated, n_distinct = 0, 0
+
+    def generated():
+        nonlocal n_generated
+        for part in iter_partitions(operator, verbose=verbose):
+            n_generated += 1
+            yield part
+
+    def distinct(parts):
+        nonlocal n_distinct
+        for part in parts:
+            n_distinct += 1
+            yield part
+
+    parts = generated()
+    if remove_isomorphic_diagrams:
+        parts = iter_remove_isomorphic(parts)
+
+    try:
+        # partitions rejected by the integer pre-pass never reach sympy
+        yield from prune_infeasible(distinct(parts), stats.pruned)
+    finally:
+        stats.partitions += n_generated
+        if n_generated > n_distinct:
+            stats.pruned["isomorphic partition"] += n_generated - n_distinct
+
+
+def complete_partitions(
+    parts: Iterable[dict],
+    stats: CompletionStats,
+    jobs=None,
+    executor=None,
+    chunksize=32,
+) -> Iterator[Union[Completion, FailedCompletion]]:
+    """Yields `partition_completion` of every partition in ``parts``, in a
+    process pool if ``jobs`` (more than one) or ``executor`` are passed in.
+    Completions by topology, failure reasons and stage times go into
+    ``stats``.
+
+    """
+    if executor is not None or (jobs is not None and jobs > 1):
+        comps = parallel_partition_completions(
+            parts, jobs=jobs, executor=executor, chunksize=chunksize, stats=stats
+        )
+    else:
+        comps = (_timed_partition_completion(p, stats.times) for p in parts)
+
+    for comp in comps:
+        if isinstance(comp, FailedCompletion):
+            stats.add_failure(comp.reason)
+        else:
+            stats.completions[comp.topology] += 1
+        yield comp
+
+
+def _timed_partition_completion(part: dict, times: Dict[str, float]):
+    with stage_times(times):
+        return partition_completion(part)
+
+
 def operator_completions(
-    operator: EffectiveOperator, verbose=False
+    operator: EffectiveOperator,
+    verbose=False,
+    jobs=None,
+    executor=None,
+    chunksize=32,
+    remove_isomorphic_diagrams=False,
+    stats=None,
 ) -> List[Completion]:
-    """Return a list of the completions of an effective operator."""
+    """Return a list of the completions of an effective operator.
+
+    If ``jobs`` (more than one) or ``executor`` are passed in, the partitions
+    are completed in a process pool (see `parallel_partition_completions`). The
+    completions are yielded in the same order either way.
+
+    If a `CompletionStats` is passed in as ``stats``, it is filled in as the
+    completions are found. ``remove_isomorphic_diagrams`` is as in
+    `operator_partitions`.
+
+    """
+    if stats is None:
+        stats = CompletionStats()
 
-    parts = partitions(operator, verbose=verbose)
     if verbose:
-        print(f"Starting with {len(parts)} partitions, removing isomorphic ones...")
+        n_parts = estimate_partitions(operator)
+        if remove_isomorphic_diagrams:
+            print(f"Starting with {n_parts} partitions, removing isomorphic ones...")
+        else:
+            print(f"Starting with {n_parts} partitions...")
 
-    # if remove_isomorphic_diagrams:
-    #     parts = remove_isomorphic(parts)
+    parts = operator_partitions(
+        operator,
+        stats,
+        verbose=verbose,
+        remove_isomorphic_diagrams=remove_isomorphic_diagrams,
+    )
+    comps = complete_partitions(
+        parts, stats, jobs=jobs, executor=executor, chunksize=chunksize
+    )
 
     if verbose:
-        print(f"Finding completions of {len(parts)} partitions...")
-        with alive_bar(len(parts)) as bar:
-            for p in parts:
-                # completions.append(partition_completion(p))
-                comp = partition_completion(p)
+        # the bar counts the partitions pruned as well as those completed, so
+        # that it ends at `estimate_partitions`
+        print(f"Finding completions of {n_parts} partitions...")
+        done = stats.processed
+        with alive_bar(n_parts) as bar:
+            for comp in comps:
                 if not isinstance(comp, FailedCompletion):
                     yield comp
-                bar()
+                bar(stats.processed - done)
+                done = stats.processed
+
+            bar(stats.processed - done)
+
+        print(stats)
     else:
-        for p in parts:
-            comp = partition_completion(p)
+        for comp in comps:
             if not isinstance(comp, FailedCompletion):
                 yield comp
 
-        # completions = [partition_completion(p) for p in parts]
-
-    # good_completions = [c for c in completions if not isinstance(c, FailedCompletion)]
-    # return good_completions
-
 
 def sort_strings(terms: List[List[str]]):
     """To account for (anti)symmetric indices, just sort the strings representing
@@ -1069,20 +1792,99 @@ def are_equivalent_completions(comp1: Completion, comp2: Completion) -> bool:
     equivalent.
 
     Two completions are equivalent if their Lagrangian terms in canonical form
-    are the same up to field relabellings.
+    are the same up to field relabellings, see `completion_key`.
 
     """
-    return bool(compare_terms(comp1, comp2))
+    return completion_key(comp1) == completion_key(comp2)
+
+
+def _base_label(label: str) -> str:
+    """The label of a field without the dagger and the tilde marking a Dirac
+    partner (see `VectorLikeDiracFermion.dirac_partner`).
+
+    """
+    return label.rstrip("†~")
+
+
+def _term_factors(term) -> List[Tuple[str, str]]:
+    """The factors of the term in canonical form as pairs of base field label
+    (see `_base_label`) and the rest of the string, with generation indices and
+    signs on indices removed as in `check_remapping_on_terms`.
+
+    """
+    s = str(safe_nocoeff(term.safe_simplify()))
+    s = re.sub(r"g[0-9]+_", "g_", s)
+    s = re.sub(r"-", "", s)
+
+    factors = []
+    for factor in s.split("*"):
+        head, paren, rest = factor.partition("(")
+        label = _base_label(head)
+        factors.append((label, head[len(label) :] + paren + rest))
+
+    return factors
+
+
+def completion_key(comp: Completion) -> tuple:
+    """A key for the completion that is the same for equivalent completions (see
+    `are_equivalent_completions`).
+
+    The exotics are relabelled by the rank of their quantum numbers, so the key
+    doesn't depend on the symbols or generation indices chosen for the fields.
+    Daggers and Dirac partner tildes are kept on the new labels.
+    Exotics with the same quantum numbers are ordered so that the key is
+    smallest.
+
+    """
+    info = comp.exotic_info()
+    qnumbers = sorted(set(info.values()))
+    groups = defaultdict(list)
+    for field, qns in info.items():
+        label = _base_label(field.label)
+        if label not in groups[qns]:
+            groups[qns].append(label)
+
+    terms = [_term_factors(term) for term in comp.terms]
+
+    keys = []
+    for orders in product(*(permutations(groups[qns]) for qns in qnumbers)):
+        relabel = {}
+        for labels in orders:
+            for label in labels:
+                relabel[label] = chr(0x2460 + len(relabel))
+
+        new_terms = [
+            [relabel.get(label, label) + rest for label, rest in factors]
+            for factors in terms
+        ]
+        keys.append(tuple(sorted(sort_strings(new_terms))))
+
+    return tuple(qnumbers), len(comp.terms), min(keys)
+
+
+def remove_equivalent_completions(comps: Iterable[Completion]) -> List[Completion]:
+    """Returns the completions without equivalent duplicates, keeping the first
+    of each. Done in a single pass using `completion_key`.
+
+    """
+    seen, out = set(), []
+    for comp in comps:
+        key = completion_key(comp)
+        if key not in seen:
+            seen.add(key)
+            out.append(comp)
+
+    return out
 
 
 def slow_remove_equivalent_completions(
     comps: List[Completion], verbose: bool = False
 ) -> List[Completion]:
-    """Compares completions by comparing Lagrangian terms. Removes duplicates and
-    returns copied list.
+    """Compares completions by comparing Lagrangian terms. Removes duplicates from
+    the list in place.
 
     """
-    remove_equivalent(comps, are_equivalent_completions)
+    comps[:] = remove_equivalent_completions(comps)
 
 
 def collect_completions(
@@ -1112,54 +1914,74 @@ def collect_completions(
     return out
 
 
-def prime_registry(sieve: Dict[tuple, List[Completion]]) -> Dict[tuple, int]:
-    """Ascribe a unique prime number to each exotic appearing in `sieve`.
+def field_registry(sieve: Dict[tuple, List[Completion]]) -> Dict[tuple, int]:
+    """Ascribe a unique bit to each exotic appearing in `sieve`.
 
     `sieve` is a dictionary mapping a tuple of field information to a list of
     completions.
 
     """
     reg = {}
-    counter = 1
-    for k, v in sieve.items():
+    for k in sieve:
         for field in k:
             if field not in reg:
-                reg[field] = prime(counter)
-                counter += 1
+                reg[field] = len(reg)
     return reg
 
 
 def model_registry(completions, registry) -> Dict[tuple, int]:
-    """Assigns an unique integer to every model by multiplying primes of fields."""
-    reg = {}
-    for k in completions:
-        prod = 1
-        for field in k:
-            prod *= registry[field]
+    """Maps every model to the bitset of its fields."""
+    return {k: sum(1 << registry[field] for field in set(k)) for k in completions}
 
-        reg[k] = prod
 
-    return reg
+def subset_index(models: Iterable[int]) -> Dict[int, List[int]]:
+    """Inverted index of the bitsets ``models`` for `has_subset`. Each bitset is
+    stored under its lowest bit, since it can only be a subset of bitsets with
+    that bit set. The empty set is stored under -1.
+
+    """
+    index = defaultdict(list)
+    for model in set(models):
+        index[(model & -model).bit_length() - 1].append(model)
+    return dict(index)
+
+
+def has_subset(index: Dict[int, List[int]], model: int) -> bool:
+    """Whether any bitset in ``index`` is a subset of ``model``. Only the
+    bitsets filed under the bits of ``model`` are looked at.
+
+    """
+    if -1 in index:
+        return True
+
+    bits = model
+    while bits:
+        lowest = bits & -bits
+        for ref in index.get(lowest.bit_length() - 1, ()):
+            if not ref & ~model:
+                return True
+        bits ^= lowest
+
+    return False
 
 
 def filter_completions(
     completions: Dict[tuple, List[Completion]], sieve: Dict[tuple, List[Completion]]
 ) -> Dict[tuple, List[Completion]]:
-    # establish prime registry
-    registry = prime_registry({**sieve, **completions})
+    """Returns the models in ``completions`` whose field content doesn't contain
+    that of a model in ``sieve``.
+
+    """
+    # establish field registry
+    registry = field_registry({**sieve, **completions})
 
-    # construct dictionaries mapping tuples of field info to integers (products
-    # of primes)
+    # construct dictionaries mapping tuples of field info to bitsets of fields
     completions_model_registry = model_registry(completions, registry)
-    sieve_model_registry = model_registry(sieve, registry)
+    index = subset_index(model_registry(sieve, registry).values())
 
     unique = {}
     for k, v in completions_model_registry.items():
-        factors_ = factors(v)
-        for ref_val in sieve_model_registry.values():
-            if ref_val in factors_:
-                break
-        else:  # no break => unique model
+        if not has_subset(index, v):
             unique[k] = completions[k]
 
     return unique
@@ -1228,46 +2050,68 @@ def derivative_combinations(
     deriv_id_func = lambda x: x
     act_deriv = lambda f: D(f, allowed_lor_dyn(f))
 
-    deriv_tuple = [act_deriv for _ in range(n_derivs)] + [
-        deriv_id_func for _ in range(len(fields) - n_derivs)
-    ]
-
+    # only the positions of the derivatives matter, in the same order as the
+    # distinct permutations of the derivatives and the other fields
     structs, out = [], []
-    for perm in permutations(deriv_tuple):
+    for positions in combinations(range(len(fields)), n_derivs):
         new_structure = []
-        for field, func in zip(fields, perm):
+        for i, field in enumerate(fields):
+            func = act_deriv if i in positions else deriv_id_func
             new_structure.append((func(field[0]), field[1]))
 
         structs.append(new_structure)
 
-    remove_equivalent(structs, eq_func=lambda x, y: x == y)
-
-    for struct in structs:
-        new_op = construct_operator(struct, epsilons)
-        if new_op.safe_simplify():
-            out.append(new_op)
+    # fresh Lorentz indices carry on from the indices of the operator, so the
+    # operators are the same every time
+    indices = IndexAllocator.after(i for t in op.tensors for i in t.get_indices())
+    with index_scope(indices):
+        for struct in structs:
+            new_op = construct_operator(struct, epsilons)
+            if new_op.safe_simplify():
+                out.append(new_op)
 
     return [EffectiveOperator(eff_op.name, i) for i in out] if eff_op else out
 
 
 def deriv_operator_completions(
-    operator: EffectiveOperator, verbose=False
+    operator: EffectiveOperator,
+    verbose=False,
+    jobs=None,
+    executor=None,
+    chunksize=32,
+    stats=None,
 ) -> List[Completion]:
     """Find the completions of a derivative operator. Differs from regular
     ``operator_completions`` in that it acts the derivatives in all possible
     ways. There shouldn't be more than one derivative acting on a single field.
 
+    The partitions of all of the IBP-related operators are completed as one
+    stream, so with ``jobs`` or ``executor`` the operators are completed
+    concurrently (see `parallel_partition_completions`). ``stats`` is as in
+    `operator_completions`.
+
     """
+    if stats is None:
+        stats = CompletionStats()
+
     deriv_combos = derivative_combinations(operator)
 
     if verbose:
         print(f"Finding completions of {len(deriv_combos)} IBP-related operators...")
 
-    comps = []
-    for combo in deriv_combos:
-        if combo.operator.simplify() == 0:
-            continue
-        comps += list(operator_completions(combo, verbose=verbose))
+    parts = (
+        part
+        for combo in deriv_combos
+        if combo.operator.simplify() != 0
+        for part in operator_partitions(combo, stats, verbose=verbose)
+    )
+    comps = complete_partitions(
+        parts, stats, jobs=jobs, executor=executor, chunksize=chunksize
+    )
+    comps = [comp for comp in comps if not isinstance(comp, FailedCompletion)]
+
+    if verbose:
+        print(stats)
 
     return comps
 
@@ -1288,45 +2132,39 @@ def collect_models(comps):
     return [Model(cs) for _, cs in list(collected.items())]
 
 
-def cons_term_prime_dict(completions: List[Completion]) -> Dict[tuple, int]:
-    # begin by generating term prime dictionary
-    term_dict = {}
-    counter = 1
-    for comp in completions:
-        n_terms = len(comp.terms)
-        for term in comp.terms:
-            # sort all of the terms by side effect
-            new_term = tuple(sorted(stringify_qns(f) for f in term.fields))
-            if new_term not in term_dict:
-                # add conj term first so that when filtering you keep
-                # the unconjugated term
-                term_dict[conjugate_term(new_term)] = prime(counter)
-                term_dict[new_term] = prime(counter)
-                counter += 1
-
-    return term_dict
-
-
-def completion_characteristic_number(
-    comp: Completion, prime_dict: Dict[tuple, int]
-) -> int:
-    prod = 1
-    for term in comp.terms:
-        new_term = tuple(sorted(stringify_qns(f) for f in term.fields))
-        prod *= prime_dict[new_term]
-    return prod
+def term_key(term) -> tuple:
+    """The sorted string representations of the fields in the term."""
+    return tuple(sorted(stringify_qns(f) for f in term.fields))
 
 
-def clean_completions(completions: List[Completion]) -> List[Completion]:
-    """A fast way of removing equivalent completions using prime label method on terms.
+def intern_term(key: tuple, term_ids: Dict[tuple, int]) -> int:
+    """Returns the integer ID of the term with fields ``key`` (see `term_key`),
+    shared with its hermitian conjugate. New terms are added to ``term_ids``.
+
+    """
+    if key not in term_ids:
+        term_ids[conjugate_term(key)] = term_ids[key] = len(term_ids)
+    return term_ids[key]
+
+
+def completion_signature(comp: Completion, term_ids: Dict[tuple, int]) -> frozenset:
+    """Set of the IDs of the terms in the completion, with their multiplicities.
+    Equal for completions with the same interaction terms up to conjugation.
 
     """
-    completions = list(completions)
-    prime_dict = cons_term_prime_dict(completions)
+    ids = Counter(intern_term(term_key(term), term_ids) for term in comp.terms)
+    return frozenset(ids.items())
 
+
+def clean_completions(completions: List[Completion]) -> List[Completion]:
+    """A fast way of removing equivalent completions by the interaction terms in
+    their Lagrangians, see `completion_signature`.
+
+    """
+    term_ids = {}
     comp_dict = {}
     for comp in completions:
-        num = completion_characteristic_number(comp, prime_dict)
-        comp_dict[(num, comp.topology)] = comp
+        signature = completion_signature(comp, term_ids)
+        comp_dict[(signature, comp.topology)] = comp
 
     return sorted((v for k, v in comp_dict.items()), key=lambda x: x.topology)
@@ -9,6 +9,7 @@ from neutrinomass.completions.operators import EFF_OPERATORS, DERIV_EFF_OPERATOR
 from sympy import Rational
 
 import pytest
+import sys
 
 
 def lnv_completions(op):
@@ -497,3 +498,342 @@ def test_remove_duplicate_completions():
     comps_len = len(comps)
     comps = clean_completions(comps)
     assert comps_len > len(comps)
+
+
+def test_parallel_operator_completions():
+    op = EFF_OPERATORS["3b"]
+    serial = clean_completions(operator_completions(op))
+    parallel = clean_completions(operator_completions(op, jobs=2, chunksize=8))
+
+    assert len(serial) == len(parallel)
+    for a, b in zip(serial, parallel):
+        assert a.topology == b.topology
+        assert a.terms == b.terms
+        assert sorted(a.exotic_info().values()) == sorted(b.exotic_info().values())
+
+
+def test_iter_partitions():
+    op = EFF_OPERATORS["3b"]
+    parts = iter_partitions(op)
+    assert not isinstance(parts, list)
+
+    parts = list(parts)
+    assert len(parts) == len(partitions(op))
+    assert len(parts) == estimate_partitions(op)
+    assert len({(p["topology"], p["partition"]) for p in parts}) == len(parts)
+
+
+def test_distinct_placements():
+    op = EFF_OPERATORS["11b"]
+    fields_and_counters = indexed_fields_with_counters(op.operator)
+    template = get_topology_data(**op.topology_type)[0]["partition"]
+
+    def class_pattern(part):
+        labels = {f: (f.label, i) for f, i in fields_and_counters.items()}
+        return tuple(labels[leaf.field] for leaf in flatten_leaves(part))
+
+    placements = list(distinct_placements(fields_and_counters, template))
+    assert len(placements) == n_distinct_placements(fields_and_counters)
+    assert len(placements) < len(
+        list(distribute_fields(list(fields_and_counters), template))
+    )
+
+    patterns = [class_pattern(p) for p in placements]
+    all_patterns = {
+        class_pattern(p) for p in distribute_fields(list(fields_and_counters), template)
+    }
+    assert len(set(patterns)) == len(patterns)
+    assert set(patterns) == all_patterns
+
+
+def flatten_leaves(part):
+    if isinstance(part, Leaf):
+        return [part]
+    return [leaf for p in part for leaf in flatten_leaves(p)]
+
+
+def test_leaf_automorphisms():
+    from neutrinomass.completions.topologies import leaf_nodes
+
+    op = EFF_OPERATORS["11b"]
+    fields_and_counters = indexed_fields_with_counters(op.operator)
+    classes = dict(zip(fields_and_counters, equivalence_classes(fields_and_counters)))
+
+    for data in get_topology_data(**op.topology_type):
+        template = data["partition"]
+        automorphisms = leaf_automorphisms(data["partition_file"])
+        nodes = [leaf.node for leaf in leaf_nodes(template)]
+        assert tuple(range(len(nodes))) in automorphisms
+
+        def pattern(part):
+            by_node = {l.node: classes[l.field] for l in flatten_leaves(part)}
+            return tuple(by_node[n] for n in nodes)
+
+        def orbit(pat):
+            out = set()
+            for perm in automorphisms:
+                image = [None] * len(pat)
+                for i, cls in enumerate(pat):
+                    image[perm[i]] = cls
+                out.add(tuple(image))
+            return out
+
+        reps = [
+            pattern(p)
+            for p in distinct_placements(fields_and_counters, template, automorphisms)
+        ]
+        assert len(reps) == n_distinct_placements(fields_and_counters, automorphisms)
+
+        # one representative from each orbit
+        covered = set()
+        for rep in reps:
+            assert not orbit(rep) & covered
+            covered |= orbit(rep)
+
+        all_patterns = distinct_placements(fields_and_counters, template)
+        assert covered == {pattern(p) for p in all_patterns}
+
+
+def test_remove_isomorphic(monkeypatch):
+    # turn off the automorphism pruning to get isomorphic partitions
+    module = sys.modules[iter_partitions.__module__]
+    monkeypatch.setattr(module, "leaf_automorphisms", lambda f: None)
+
+    parts = partitions(EFF_OPERATORS["3b"])
+    unique = remove_isomorphic(parts)
+    assert len(unique) < len(parts)
+
+    pairwise = remove_equivalent_nopop(list(parts), are_equivalent_partitions)
+    assert len(unique) == len(pairwise)
+    assert len(remove_isomorphic(parts + parts)) == len(unique)
+
+    # the filter is off by default, but still removes these when switched on
+    stats = CompletionStats()
+    list(
+        operator_partitions(EFF_OPERATORS["3b"], stats, remove_isomorphic_diagrams=True)
+    )
+    assert stats.pruned["isomorphic partition"] == len(parts) - len(unique)
+
+
+def test_remove_isomorphic_diagrams():
+    # with the automorphism pruning the filter finds nothing to remove
+    op = EFF_OPERATORS["3b"]
+    stats, filtered_stats = CompletionStats(), CompletionStats()
+    parts = list(operator_partitions(op, stats))
+    filtered = list(
+        operator_partitions(op, filtered_stats, remove_isomorphic_diagrams=True)
+    )
+    assert len(filtered) == len(parts)
+    assert filtered_stats.pruned == stats.pruned
+    assert "isomorphic partition" not in filtered_stats.pruned
+
+
+def test_partition_graph():
+    parts = partitions(EFF_OPERATORS["3b"])
+    # the topology graphs are shared and left untouched
+    topologies = {id(p["graph"].topology) for p in parts}
+    assert len(topologies) == len({p["topology"] for p in parts})
+
+    comps = [partition_completion(p) for p in parts]
+    for part, comp in zip(parts, comps):
+        assert not nx.get_edge_attributes(part["graph"].topology, "particle")
+        if isinstance(comp, FailedCompletion):
+            continue
+
+        # all edges are labelled on the materialised graph
+        assert isinstance(comp.graph, nx.Graph)
+        labels = nx.get_edge_attributes(comp.graph, "particle")
+        assert len(labels) == comp.graph.number_of_edges()
+
+
+def test_contraction_cache(monkeypatch):
+    parts = partitions(EFF_OPERATORS["3b"])
+
+    def terms(comps):
+        out = []
+        for comp in comps:
+            if isinstance(comp, FailedCompletion):
+                out.append(comp.reason)
+            else:
+                out.append(sorted(str(sorted(map(str, t.fields))) for t in comp.terms))
+        return out
+
+    module = sys.modules[contract.__module__]
+    clear_contraction_cache()
+    cached = [partition_completion(p) for p in parts]
+    assert module._CONTRACTION_CACHE
+    # second pass is served from the cache
+    assert terms(cached) == terms([partition_completion(p) for p in parts])
+
+    monkeypatch.setattr(module, "contract", module._contract)
+    uncached = [partition_completion(p) for p in parts]
+    assert terms(cached) == terms(uncached)
+
+
+def test_infeasible_reason():
+    op = EFF_OPERATORS["7"]
+    parts = partitions(op, topology=0)
+
+    pruned = Counter()
+    feasible = list(prune_infeasible(parts, pruned))
+    assert pruned and sum(pruned.values()) + len(feasible) == len(parts)
+
+    # the pre-pass agrees with the full completion
+    reasons = [infeasible_reason(p["partition"]) for p in parts[:40]]
+    for part, reason in zip(parts, reasons):
+        if reason is not None:
+            args = (part["partition"], part["epsilons"], part["graph"])
+            assert construct_completion(*args) == reason
+
+
+def test_vanishes_by_symmetry():
+    from neutrinomass.tensormethod.core import eps
+
+    assert vanishes_by_symmetry(H("i0") * H("i1") * eps("-i0 -i1"))
+    assert vanishes_by_symmetry(
+        L("u0 i0") * L("u1 i1") * eps("-u0 -u1") * eps("-i0 -i1")
+    )
+
+    # can't decide: the isospin indices of the leptons go to different places
+    weinberg = (
+        L("u0 i0")
+        * L("u1 i1")
+        * H("i2")
+        * H("i3")
+        * eps("-u0 -u1")
+        * eps("-i0 -i2")
+        * eps("-i1 -i3")
+    )
+    assert not vanishes_by_symmetry(weinberg)
+    assert not is_vanishing(weinberg)
+
+    assert not vanishes_by_symmetry(L("u0 i0") * H("i1") * eps("-i0 -i1"))
+
+
+def test_intern_term():
+    term_ids = {}
+    key = ("H", "L", "S,00,0,1/2,0")
+    conj = conjugate_term(key)
+    assert intern_term(key, term_ids) == intern_term(conj, term_ids)
+    assert intern_term(("H", "H.conj"), term_ids) != intern_term(key, term_ids)
+
+    comps = list(operator_completions(EFF_OPERATORS["2"]))
+    signatures = [completion_signature(c, term_ids) for c in comps]
+    assert all(isinstance(s, frozenset) for s in signatures)
+    assert len(clean_completions(comps)) == len(
+        set(zip(signatures, [c.topology for c in comps]))
+    )
+
+
+def test_subset_index():
+    import random
+
+    random.seed(0)
+    fields = list(range(12))
+    sets = lambda n, k: [frozenset(random.sample(fields, k)) for _ in range(n)]
+    sieve, models = sets(30, 2), sets(200, 4)
+
+    registry = {f: f for f in fields}
+    mask = lambda s: sum(1 << registry[f] for f in s)
+    index = subset_index(mask(s) for s in sieve)
+    for m in models:
+        assert has_subset(index, mask(m)) == any(s <= m for s in sieve)
+
+    assert has_subset(subset_index([0]), mask(models[0]))
+    assert not has_subset(subset_index([]), mask(models[0]))
+
+
+def test_completion_key():
+    comps = list(operator_completions(EFF_OPERATORS["3b"]))
+    unique = remove_equivalent_completions(comps)
+    assert len(unique) < len(comps)
+
+    keys = [completion_key(c) for c in comps]
+    for i, j in combinations(range(len(comps)), 2):
+        if compare_terms(comps[i], comps[j]):
+            assert keys[i] == keys[j]
+
+    assert len(unique) == len(set(keys))
+
+
+def test_completion_key_symbols():
+    def toy_completion(fermion, scalar):
+        charges = {"y": Rational(-1, 3), "3b": 0}
+        psi = VectorLikeDiracFermion(fermion, "u1 c1", charges=charges)
+        phi = ComplexScalar(scalar, "c2", charges=charges)
+        psi_bar = VectorLikeDiracFermion(fermion, "u2 c2", charges=charges)
+        psi_bar = psi_bar.dirac_partner()
+        terms = [
+            db("u0 -c1 g0") * psi * eps("-u0 -u1"),
+            psi_bar * phi * L("u3 i0 g0") * H("i1") * eps("-u2 -u3") * eps("-i0 -i1"),
+        ]
+        return Completion(None, None, None, [psi, phi], terms)
+
+    # only the symbols of the exotics differ, including the Dirac partner ψ~
+    comp = toy_completion("ψ", "φ")
+    assert "ψ~" in str(comp.terms[1])
+    assert completion_key(comp) == completion_key(toy_completion("χ", "η"))
+
+
+def test_parallel_deriv_operator_completions():
+    op = DERIV_EFF_OPERATORS["D2a"]
+    from math import comb
+
+    stripped = operator_strip_derivs(op.operator)
+    n_placements = comb(len(stripped["fields"]), stripped["n_derivs"])
+    assert len(derivative_combinations(op)) <= n_placements
+
+    serial = clean_completions(deriv_operator_completions(op))
+    parallel = clean_completions(deriv_operator_completions(op, jobs=2, chunksize=4))
+
+    assert serial
+    assert len(serial) == len(parallel)
+    for a, b in zip(serial, parallel):
+        assert a.topology == b.topology
+        assert sorted(a.exotic_info().values()) == sorted(b.exotic_info().values())
+
+
+def test_completion_stats(monkeypatch):
+    from neutrinomass.completions.core import CompletionStats
+
+    op = EFF_OPERATORS["4a"]
+    stats = CompletionStats()
+    comps = list(operator_completions(op, stats=stats))
+    assert stats.partitions == 15
+    assert stats.pruned == {"lorentz infeasible": 10}
+    # what the verbose progress bar counts up to
+    assert stats.processed == estimate_partitions(op) == 15
+    assert sum(stats.completions.values()) == len(comps)
+    assert not stats.failures
+    assert {"partition_completion", "contract"} <= set(stats.times)
+
+    # without the pre-pass the same partitions fail in `construct_completion`
+    module = sys.modules[construct_completion.__module__]
+    monkeypatch.setattr(module, "infeasible_reason", lambda p: None)
+    unpruned = CompletionStats()
+    assert len(list(operator_completions(op, stats=unpruned))) == len(comps)
+    assert unpruned.failures == stats.pruned
+    assert unpruned.failure_examples == {
+        "lorentz infeasible": ["Bad Lorentz contraction."]
+    }
+
+    # failures are counted by category whatever the term in the reason
+    for term in ["φ*L*H", "φ*Q*db", "φ*L*L", "φ*H*H"]:
+        unpruned.add_failure(
+            f"Vanishing coupling at {term} after derivative processing."
+        )
+    assert unpruned.failures["vanishing coupling"] == 4
+    assert len(unpruned.failure_examples["vanishing coupling"]) == 3
+
+    stats.update(unpruned)
+    assert stats.as_dict()["partitions"] == 30
+
+
+def test_deterministic_indices():
+    op = DERIV_EFF_OPERATORS["D2a"]
+    key = lambda comps: [[str(t) for t in c.terms] for c in comps]
+
+    first = key(deriv_operator_completions(op))
+    clear_contraction_cache()
+    Index.fresh("u")  # move the global counter along
+    assert key(deriv_operator_completions(op)) == first
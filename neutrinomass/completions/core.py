@@ -3,6 +3,7 @@
 """Core classes and functions for completions code."""
 
 import sys
+from collections import Counter
 from typing import Dict
 from copy import deepcopy
 
@@ -396,6 +397,116 @@ class FailedCompletion:
         self.reason = reason
 
 
+# prefixes of the reasons completions fail, and the category they are counted in
+FAILURE_CATEGORIES = {
+    "Bad Lorentz contraction": "lorentz infeasible",
+    "Not allowed contraction": "no contraction",
+    "Vanishing structure": "vanishing structure",
+    "Vanishing coupling": "vanishing coupling",
+}
+
+# number of failure reasons kept per category in `CompletionStats`
+MAX_FAILURE_EXAMPLES = 3
+
+
+def failure_category(reason: str) -> str:
+    """The category in `FAILURE_CATEGORIES` of the reason a completion failed,
+    or "other".
+
+    """
+    for prefix, category in FAILURE_CATEGORIES.items():
+        if reason.startswith(prefix):
+            return category
+    return "other"
+
+
+class CompletionStats:
+    """Statistics of a run of the completion pipeline, filled in by
+    `operator_completions` when passed in.
+
+    Attributes:
+        partitions: Number of partitions generated.
+        pruned: Counter of the partitions removed before completion, by
+            `failure_category` or as "isomorphic partition".
+        completions: Counter of the completions found, by topology.
+        failures: Counter of the `FailedCompletion` reasons, by
+            `failure_category`.
+        failure_examples: The first few distinct `FailedCompletion` reasons in
+            each category.
+        times: Wall time in seconds spent in each stage (see
+            `neutrinomass.utils.stage_timer`), including nested stages.
+
+    """
+
+    def __init__(self):
+        self.partitions = 0
+        self.pruned = Counter()
+        self.completions = Counter()
+        self.failures = Counter()
+        self.failure_examples = {}
+        self.times = {}
+
+    @property
+    def processed(self) -> int:
+        """Number of partitions pruned or completed, successfully or not."""
+        return (
+            sum(self.pruned.values())
+            + sum(self.completions.values())
+            + sum(self.failures.values())
+        )
+
+    def add_failure(self, reason: str):
+        category = failure_category(reason)
+        self.failures[category] += 1
+        examples = self.failure_examples.setdefault(category, [])
+        if len(examples) < MAX_FAILURE_EXAMPLES and reason not in examples:
+            examples.append(reason)
+
+    def add_times(self, times: Dict[str, float]):
+        for stage, time in times.items():
+            self.times[stage] = self.times.get(stage, 0.0) + time
+
+    def update(self, other: "CompletionStats"):
+        """Adds the statistics of ``other``, e.g. from another operator."""
+        self.partitions += other.partitions
+        self.pruned.update(other.pruned)
+        self.completions.update(other.completions)
+        self.failures.update(other.failures)
+        for category, reasons in other.failure_examples.items():
+            examples = self.failure_examples.setdefault(category, [])
+            for reason in reasons:
+                if len(examples) < MAX_FAILURE_EXAMPLES and reason not in examples:
+                    examples.append(reason)
+        self.add_times(other.times)
+
+    def as_dict(self) -> dict:
+        return {
+            "partitions": self.partitions,
+            "pruned": dict(self.pruned),
+            "completions": dict(self.completions),
+            "failures": dict(self.failures),
+            "failure_examples": {k: list(v) for k, v in self.failure_examples.items()},
+            "times": dict(self.times),
+        }
+
+    def __repr__(self):
+        lines = [
+            f"Partitions: {self.partitions}",
+            f"Pruned: {sum(self.pruned.values())} {dict(self.pruned)}",
+            f"Completions: {sum(self.completions.values())}",
+            f"Failed: {sum(self.failures.values())}",
+        ]
+        for category, n in self.failures.most_common():
+            lines.append(f"  {n:>6d}  {category}")
+            for reason in self.failure_examples.get(category, []):
+                lines.append(f"          e.g. {reason}")
+        lines.append("Times:")
+        for stage, time in sorted(self.times.items(), key=lambda x: -x[1]):
+            lines.append(f"  {time:>9.2f}s  {stage}")
+
+        return "\n".join(lines)
+
+
 class Completion:
     def __init__(self, operator, partition, graph, exotics, terms, topology=None):
         self.operator = operator
@@ -18,6 +18,7 @@ for label, op in EFF_OPERATORS.items():
     else:
         break
 
+filtered_models = {}
 prev = {}
 for dim, models in completions.items():
     collected = collect_completions(models)
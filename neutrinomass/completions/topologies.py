@@ -3,10 +3,14 @@
 """Functions to read and parse topologies generated with Mathematica."""
 
 import os
+import json
+import hashlib
 from glob import glob
+from functools import lru_cache
 import matplotlib.pyplot as plt
 import networkx as nx
-from typing import NamedTuple
+import networkx.algorithms.isomorphism as iso
+from typing import Dict, List, NamedTuple, Tuple
 from neutrinomass.tensormethod.core import IndexedField
 
 # PATH_TO_MV = "/Users/johngargalionis/Dropbox/PhD/mv/"
@@ -16,6 +20,8 @@ TOPOLOGY_PATH = os.path.join(os.path.dirname(__file__), "topology_data")
 PARTITIONS = os.path.join(TOPOLOGY_PATH, "partitions")
 DIAGRAMS = os.path.join(TOPOLOGY_PATH, "diagrams")
 GRAPHS = os.path.join(TOPOLOGY_PATH, "graphs")
+# all of the partitions and graphs above in one file, see `compile_topology_index`
+TOPOLOGY_INDEX = os.path.join(TOPOLOGY_PATH, "index.json")
 
 
 class Leaf(NamedTuple):
@@ -23,6 +29,58 @@ class Leaf(NamedTuple):
     node: int
 
 
+class PartitionGraph:
+    """A topology graph shared between partitions, overlaid with the edge
+    attributes of a single partition.
+
+    The topology is never copied or mutated: setting edge attributes returns a
+    new overlay. Use `to_networkx` to materialise the labelled graph.
+
+    """
+
+    __slots__ = ("topology", "edge_attrs")
+
+    def __init__(self, topology: nx.Graph, edge_attrs: Dict[Tuple[int, int], dict]):
+        self.topology = topology
+        self.edge_attrs = edge_attrs
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph) -> "PartitionGraph":
+        edge_attrs = {(u, v): dict(d) for u, v, d in graph.edges(data=True) if d}
+        return cls(nx.freeze(nx.Graph(graph.edges)), edge_attrs)
+
+    def neighbors(self, node: int):
+        return self.topology.neighbors(node)
+
+    def edge_data(self, u: int, v: int) -> dict:
+        data = self.edge_attrs.get((u, v))
+        if data is None:
+            data = self.edge_attrs.get((v, u), {})
+        return data
+
+    def labelled_edges(self):
+        """Iterates over the edges as ``(u, v, attrs)``, like
+        ``nx.Graph.edges(data=True)``.
+
+        """
+        for u, v in self.topology.edges:
+            yield u, v, self.edge_data(u, v)
+
+    def with_edge_attrs(self, edge_attrs: Dict[Tuple[int, int], dict]):
+        """Returns a new overlay with ``edge_attrs`` updating the current ones."""
+        new_attrs = dict(self.edge_attrs)
+        for (u, v), data in edge_attrs.items():
+            key = (u, v) if (u, v) in new_attrs or (v, u) not in new_attrs else (v, u)
+            new_attrs[key] = {**new_attrs.get(key, {}), **data}
+
+        return PartitionGraph(self.topology, new_attrs)
+
+    def to_networkx(self) -> nx.Graph:
+        g = nx.Graph()
+        g.add_edges_from(self.labelled_edges())
+        return g
+
+
 def read_topology_file(data_path) -> str:
     """Reads the topology and returns the contents of the data file as a string."""
     with open(data_path, "r") as f:
@@ -53,30 +111,204 @@ def eval_graph(graph: str):
     return G
 
 
-def get_topology_data(n_scalars, n_fermions):
-    """Returns a list of dictionaries with data from topology data files.
+def topology_class(n_scalars, n_fermions) -> str:
+    return f"{n_scalars}s{n_fermions}f"
 
-    [{"partition": parition_string, "graph": graph_string, "img": image}]
 
-    """
-    partition_files = sorted(glob(PARTITIONS + f"/{n_scalars}s{n_fermions}f_*"))
-    diagram_files = sorted(glob(DIAGRAMS + f"/{n_scalars}s{n_fermions}f_*"))
-    graph_files = sorted(glob(GRAPHS + f"/{n_scalars}s{n_fermions}f_*"))
+def read_topology_files(n_scalars, n_fermions) -> List[dict]:
+    """Reads the topologies of a class from the data files in ``partitions/``
+    and ``graphs/``, returning a list of dictionaries with the partition
+    template, graph and path to the partition file.
 
-    if not partition_files:
-        raise Exception("Topologies not found, please generate them again.")
+    """
+    name = topology_class(n_scalars, n_fermions)
+    partition_files = sorted(glob(PARTITIONS + f"/{name}_*"))
+    graph_files = sorted(glob(GRAPHS + f"/{name}_*"))
 
     out = []
-    for p, d, g in zip(partition_files, diagram_files, graph_files):
+    for p, g in zip(partition_files, graph_files):
         topology = {}
         partition_string = eval_partition(read_topology_file(p))
-        # img = plt.imread(d)
         graph_string = eval_graph(read_topology_file(g))
 
         topology["partition"] = partition_string
         topology["graph"] = graph_string
-        # topology["diagram"] = img
         topology["partition_file"] = p
         out.append(topology)
 
     return out
+
+
+def compact_partition(partition):
+    """Partition template as nested lists for json, with leaves as ["S", node]."""
+    if isinstance(partition, Leaf):
+        return list(partition)
+    return [compact_partition(p) for p in partition]
+
+
+def expand_partition(data):
+    """Inverse of `compact_partition`."""
+    if isinstance(data[0], str):
+        return Leaf(*data)
+    return tuple(expand_partition(d) for d in data)
+
+
+def topology_files(name: str) -> List[str]:
+    """The partition and graph files of the topology class ``name``."""
+    return sorted(glob(PARTITIONS + f"/{name}_*")) + sorted(glob(GRAPHS + f"/{name}_*"))
+
+
+def topology_fingerprint(name: str) -> str:
+    """A hash of the names and contents of the data files of the topology class
+    ``name``, stored in the index to tell when it is out of date.
+
+    """
+    digest = hashlib.sha1()
+    for path in topology_files(name):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def compile_topology_index(path: str = TOPOLOGY_INDEX) -> None:
+    """Writes every topology class in the data files to a single index file,
+    with the partition templates as nested lists and the graphs as edge
+    lists. Classes whose data files have changed since are read from the
+    files again, see `topology_fingerprint`.
+
+    """
+    classes = sorted(
+        {os.path.basename(p).split("_")[0] for p in glob(PARTITIONS + "/*")}
+    )
+
+    index = {}
+    for name in classes:
+        n_scalars, n_fermions = name[:-1].split("s")
+        topologies = []
+        for t in read_topology_files(n_scalars, n_fermions):
+            file = os.path.basename(t["partition_file"])
+            graph_file = os.path.join(GRAPHS, os.path.splitext(file)[0] + ".csv")
+            # keep the order of the edges in the file, the graph's node order
+            # depends on it
+            edges = read_topology_file(graph_file).splitlines()
+            topologies.append(
+                {
+                    "file": file,
+                    "partition": compact_partition(t["partition"]),
+                    "edges": [[int(i) for i in e.split(",")] for e in edges],
+                }
+            )
+
+        index[name] = {
+            "fingerprint": topology_fingerprint(name),
+            "topologies": topologies,
+        }
+
+    with open(path, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+
+
+@lru_cache(maxsize=None)
+def _topology_index() -> dict:
+    if not os.path.exists(TOPOLOGY_INDEX):
+        return {}
+
+    with open(TOPOLOGY_INDEX, "r") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def _load_topology_class(name: str) -> Tuple[dict, ...]:
+    # Topologies are taken from the index when it is up to date with the data
+    # files, otherwise read from the files. The graphs are frozen since they
+    # are shared, see `PartitionGraph`.
+    n_scalars, n_fermions = name[:-1].split("s")
+    compiled = _topology_index().get(name)
+    if compiled is None or compiled["fingerprint"] != topology_fingerprint(name):
+        topologies = read_topology_files(n_scalars, n_fermions)
+    else:
+        topologies = []
+        for t in compiled["topologies"]:
+            graph = nx.Graph()
+            graph.add_edges_from(t["edges"])
+            topologies.append(
+                {
+                    "partition": expand_partition(t["partition"]),
+                    "graph": graph,
+                    "partition_file": os.path.join(PARTITIONS, t["file"]),
+                }
+            )
+
+    for t in topologies:
+        nx.freeze(t["graph"])
+
+    return tuple(topologies)
+
+
+def get_topology_data(n_scalars, n_fermions):
+    """Returns a list of dictionaries with data from topology data files.
+
+    [{"partition": parition_string, "graph": graph_string, "img": image}]
+
+    Each class is loaded once from the compiled index (see
+    `compile_topology_index`) and cached.
+
+    """
+    topologies = _load_topology_class(topology_class(n_scalars, n_fermions))
+    if not topologies:
+        raise FileNotFoundError("Topologies not found, please generate them again.")
+
+    return [dict(t) for t in topologies]
+
+
+def leaf_nodes(partition) -> List[Leaf]:
+    """Returns the scalar leaves followed by the fermion leaves of a partition
+    template, each in the order they are filled by `replace_fields`.
+
+    """
+
+    def flatten_leaves(data):
+        if isinstance(data, Leaf):
+            return [data]
+        return [leaf for datai in data for leaf in flatten_leaves(datai)]
+
+    leaves = flatten_leaves(partition)
+    return [l for l in leaves if l.field == "S"] + [l for l in leaves if l.field == "F"]
+
+
+@lru_cache(maxsize=None)
+def leaf_automorphisms(partition_file: str) -> List[Tuple[int, ...]]:
+    """Returns the automorphism group of the topology in ``partition_file`` as
+    permutations of the positions of its leaves in `leaf_nodes`. Automorphisms
+    map scalar leaves to scalar leaves and fermion leaves to fermion leaves.
+    The result is cached, so the group of each topology is only found once.
+
+    """
+    name = os.path.basename(partition_file).split("_")[0]
+    for topology in _load_topology_class(name):
+        if topology["partition_file"] == partition_file:
+            break
+    else:
+        raise ValueError(f"Unknown topology {partition_file}")
+
+    partition = topology["partition"]
+    graph = nx.Graph(topology["graph"])
+
+    leaves = leaf_nodes(partition)
+    position = {leaf.node: i for i, leaf in enumerate(leaves)}
+    nx.set_node_attributes(graph, {leaf.node: leaf.field for leaf in leaves}, "leaf")
+
+    nm = iso.categorical_node_match("leaf", None)
+    matcher = iso.GraphMatcher(graph, graph, node_match=nm)
+
+    perms = set()
+    for mapping in matcher.isomorphisms_iter():
+        perms.add(tuple(position[mapping[leaf.node]] for leaf in leaves))
+
+    return sorted(perms)
+
+
+if __name__ == "__main__":
+    compile_topology_index()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+from neutrinomass.completions import topologies
+from neutrinomass.completions.topologies import *
+
+
+def test_topology_index():
+    for n_scalars, n_fermions in [(1, 4), (2, 4), (0, 6)]:
+        from_files = read_topology_files(n_scalars, n_fermions)
+        from_index = get_topology_data(n_scalars, n_fermions)
+        assert len(from_files) == len(from_index)
+
+        for f, i in zip(from_files, from_index):
+            assert f["partition"] == i["partition"]
+            assert f["partition_file"] == i["partition_file"]
+            assert list(f["graph"].edges) == list(i["graph"].edges)
+
+    # loaded once and shared
+    a, b = get_topology_data(1, 4), get_topology_data(1, 4)
+    assert a[0]["graph"] is b[0]["graph"]
+
+
+def test_topology_index_fingerprint(monkeypatch):
+    # the shipped index is up to date with the data files
+    index = topologies._topology_index()
+    assert index
+    for name, compiled in index.items():
+        assert compiled["fingerprint"] == topology_fingerprint(name)
+
+    # a stale class is read from the data files
+    stale = {name: {"fingerprint": "", "topologies": []} for name in index}
+    monkeypatch.setattr(topologies, "_topology_index", lambda: stale)
+    topologies._load_topology_class.cache_clear()
+    try:
+        assert len(get_topology_data(1, 4)) == len(read_topology_files(1, 4))
+    finally:
+        topologies._load_topology_class.cache_clear()
+
+
+def test_compact_partition():
+    partition = ((Leaf("F", 6), Leaf("S", 18)), Leaf("F", 54))
+    assert expand_partition(compact_partition(partition)) == partition
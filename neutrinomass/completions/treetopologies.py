@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+
+"""Generates the tree-level topologies read in `neutrinomass.completions.topologies`
+without Mathematica.
+
+The topologies are the trees with ``n_scalars`` scalar and ``n_fermions``
+fermion external legs whose internal vertices are cubic or quartic, with
+internal lines that are either scalars or fermions. As with the FeynArts
+generic model used in ``wolfram/generatetopologies.wl``, the allowed vertices
+are FFS, SSS and SSSS, and the bare vertex (the operator itself) is left out.
+Topologies are deduplicated by a canonical form of the tree with its lines
+labelled by particle type.
+
+The output follows the files written by the Mathematica script: external
+vertex ``k`` is labelled ``2 * 3**k`` (fermions first), internal vertex ``k``
+of degree ``d`` is labelled ``2**d * 3**k``, and the partition is read off the
+tree from the vertex with the largest label.
+
+Example:
+    $ python -m neutrinomass.completions.treetopologies topology_data 2 6
+
+"""
+
+import os
+import argparse
+from itertools import combinations
+from typing import Dict, Iterator, List, Set, Tuple
+
+Tree = Dict[int, Set[int]]
+
+SCALAR, FERMION = "S", "F"
+
+
+def _edges(tree: Tree) -> List[Tuple[int, int]]:
+    return [(u, v) for u in tree for v in tree[u] if u < v]
+
+
+def _rooted_form(tree: Tree, node: int, parent, colours: dict) -> str:
+    children = sorted(
+        _rooted_form(tree, child, node, colours)
+        for child in tree[node]
+        if child != parent
+    )
+    colour = "" if parent is None else colours.get(frozenset((node, parent)), "")
+    return "(" + colour + "".join(children) + ")"
+
+
+def canonical_form(tree: Tree, colours: dict = None) -> str:
+    """Returns a string equal for trees isomorphic as (line-labelled) graphs: the
+    smallest of the forms of the tree rooted at each internal vertex.
+
+    """
+    colours = {} if colours is None else colours
+    internal = [n for n, neighbours in tree.items() if len(neighbours) > 1]
+    return min(_rooted_form(tree, n, None, colours) for n in internal)
+
+
+def _copy(tree: Tree) -> Tree:
+    return {k: set(v) for k, v in tree.items()}
+
+
+def _grow(tree: Tree) -> Iterator[Tree]:
+    """Yields the trees with one more external leg: either a cubic vertex
+    inserted on a line, or a leg added to a cubic vertex.
+
+    """
+    leaf = max(tree) + 1
+    vertex = leaf + 1
+    for u, v in _edges(tree):
+        new = _copy(tree)
+        new[u].remove(v)
+        new[v].remove(u)
+        new[vertex] = {u, v, leaf}
+        new[u].add(vertex)
+        new[v].add(vertex)
+        new[leaf] = {vertex}
+        yield new
+
+    for node, neighbours in tree.items():
+        if len(neighbours) == 3:
+            new = _copy(tree)
+            new[node].add(leaf)
+            new[leaf] = {node}
+            yield new
+
+
+def tree_shapes(n_legs: int) -> List[Tree]:
+    """Returns the distinct trees with ``n_legs`` external legs and cubic and
+    quartic internal vertices.
+
+    """
+    if n_legs < 3:
+        raise ValueError("Need at least three external legs.")
+
+    shapes = [{0: {1, 2, 3}, 1: {0}, 2: {0}, 3: {0}}]
+    for _ in range(n_legs - 3):
+        seen, new_shapes = set(), []
+        for shape in shapes:
+            for tree in _grow(shape):
+                form = canonical_form(tree)
+                if form not in seen:
+                    seen.add(form)
+                    new_shapes.append(tree)
+        shapes = new_shapes
+
+    return shapes
+
+
+def line_colours(tree: Tree, fermion_leaves: Set[int]) -> dict:
+    """Returns the particle type of every line of the tree given the external
+    fermions, or None if a vertex isn't FFS, SSS or SSSS.
+
+    Every vertex has an even number of fermion lines, so a line is a fermion
+    exactly when it separates an odd number of external fermions.
+
+    """
+    root = next(n for n, neighbours in tree.items() if len(neighbours) > 1)
+    colours = {}
+
+    def n_fermions(node, parent):
+        if len(tree[node]) == 1:
+            n = int(node in fermion_leaves)
+        else:
+            n = sum(n_fermions(c, node) for c in tree[node] if c != parent)
+        colours[frozenset((node, parent))] = FERMION if n % 2 else SCALAR
+        return n
+
+    for child in tree[root]:
+        n_fermions(child, root)
+
+    for node, neighbours in tree.items():
+        fermion_lines = sum(
+            colours[frozenset((node, n))] == FERMION for n in neighbours
+        )
+        if len(neighbours) == 3 and fermion_lines not in (0, 2):
+            return None
+        if len(neighbours) == 4 and fermion_lines != 0:
+            return None
+
+    return colours
+
+
+def generate_topologies(n_scalars: int, n_fermions: int) -> List[Tuple[Tree, dict]]:
+    """Returns a list of the distinct topologies as pairs of tree and line
+    colours.
+
+    """
+    out, seen = [], set()
+    for tree in tree_shapes(n_scalars + n_fermions):
+        # a single vertex is the operator itself, not a completion
+        if len(tree) == n_scalars + n_fermions + 1:
+            continue
+
+        leaves = sorted(n for n, neighbours in tree.items() if len(neighbours) == 1)
+        for fermions in combinations(leaves, n_fermions):
+            colours = line_colours(tree, set(fermions))
+            if colours is None:
+                continue
+
+            form = canonical_form(tree, colours)
+            if form not in seen:
+                seen.add(form)
+                out.append((tree, colours))
+
+    return out
+
+
+def topology_canonical_form(topology: dict) -> str:
+    """Canonical form of a topology read by
+    `neutrinomass.completions.topologies.get_topology_data`, to compare with
+    the generated ones.
+
+    """
+    graph = topology["graph"]
+    tree = {n: set(graph.neighbors(n)) for n in graph.nodes}
+
+    def leaves(data):
+        if isinstance(data[0], str):
+            return [data]
+        return [leaf for d in data for leaf in leaves(d)]
+
+    fermions = {l.node for l in leaves(topology["partition"]) if l.field == FERMION}
+    return canonical_form(tree, line_colours(tree, fermions))
+
+
+def label_vertices(tree: Tree, colours: dict) -> Dict[int, int]:
+    """Maps the vertices of the tree to the integer labels used in the topology
+    data files.
+
+    """
+    leaves = [n for n, neighbours in tree.items() if len(neighbours) == 1]
+    leaf_colour = {n: colours[frozenset((n, *tree[n]))] for n in leaves}
+    fermions = sorted(n for n in leaves if leaf_colour[n] == FERMION)
+    scalars = sorted(n for n in leaves if leaf_colour[n] == SCALAR)
+    internal = sorted(n for n, neighbours in tree.items() if len(neighbours) > 1)
+
+    labels = {}
+    for k, n in enumerate(fermions + scalars + internal, start=1):
+        labels[n] = 2 ** len(tree[n]) * 3**k
+
+    return labels
+
+
+def topology_strings(tree: Tree, colours: dict) -> Tuple[str, str]:
+    """Returns the contents of the partition and graph files for a topology."""
+    labels = label_vertices(tree, colours)
+    edges = sorted(tuple(sorted((labels[u], labels[v]))) for u, v in _edges(tree))
+    graph = "\n".join(f"{u},{v}" for u, v in edges)
+
+    neighbours = {label: [] for label in labels.values()}
+    for u, v in edges:
+        neighbours[u].append(v)
+        neighbours[v].append(u)
+
+    def partition(node, parent):
+        if len(neighbours[node]) == 1:
+            colour = colours[
+                frozenset(n for n, l in labels.items() if l in (node, parent))
+            ]
+            return f"{colour}({node})"
+
+        rows = [partition(c, node) for c in neighbours[node] if c != parent]
+        return "List(" + ",".join(rows) + ")"
+
+    return partition(max(neighbours), None), graph
+
+
+def write_topologies(path: str, n_scalars: int, n_fermions: int) -> int:
+    """Writes the partition and graph files of the topologies with ``n_scalars``
+    and ``n_fermions`` external legs into the directory ``path``, laid out like
+    ``topology_data``. Returns the number of topologies written.
+
+    """
+    prefix = f"{n_scalars}s{n_fermions}f"
+    topologies = generate_topologies(n_scalars, n_fermions)
+    for i, (tree, colours) in enumerate(topologies, start=1):
+        partition, graph = topology_strings(tree, colours)
+        for directory, ext, data in [
+            ("partitions", "dat", partition),
+            ("graphs", "csv", graph),
+        ]:
+            os.makedirs(os.path.join(path, directory), exist_ok=True)
+            with open(os.path.join(path, directory, f"{prefix}_{i}.{ext}"), "w") as f:
+                f.write(data)
+
+    return len(topologies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("output", type=str)
+    parser.add_argument("n_scalars", type=int)
+    parser.add_argument("n_fermions", type=int)
+    args = parser.parse_args()
+
+    n = write_topologies(args.output, args.n_scalars, args.n_fermions)
+    print(f"{n} topologies written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+from neutrinomass.completions.treetopologies import *
+from neutrinomass.completions.topologies import (
+    get_topology_data,
+    eval_partition,
+    eval_graph,
+)
+
+
+def test_generate_topologies():
+    for n_scalars, n_fermions in [(4, 0), (2, 2), (1, 4), (3, 4), (0, 6)]:
+        generated = {
+            canonical_form(*t) for t in generate_topologies(n_scalars, n_fermions)
+        }
+        shipped = {
+            topology_canonical_form(t) for t in get_topology_data(n_scalars, n_fermions)
+        }
+        assert generated == shipped
+
+
+def test_topology_strings():
+    (topology,) = generate_topologies(0, 4)
+    partition, graph = topology_strings(*topology)
+    assert partition == "List(F(6),F(162),List(F(18),F(54)))"
+    assert graph.splitlines() == [
+        "6,5832",
+        "18,1944",
+        "54,1944",
+        "162,5832",
+        "1944,5832",
+    ]
+    parsed = {"partition": eval_partition(partition), "graph": eval_graph(graph)}
+    assert topology_canonical_form(parsed) == canonical_form(*topology)
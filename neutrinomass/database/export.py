@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 
-from neutrinomass.completions.core import Completion, cons_completion_field
-from neutrinomass.completions.topologies import Leaf
+from neutrinomass.completions.core import (
+    Completion,
+    EffectiveOperator,
+    cons_completion_field,
+)
+from neutrinomass.completions.topologies import Leaf, PartitionGraph
 from neutrinomass.tensormethod.core import Field, IndexedField, eps, delta, Operator
 from neutrinomass.completions.core import FieldType
 from neutrinomass.utils.functions import stringify_qns
 
 import networkx as nx
+from typing import Dict
 
 
 def export_tensor(tensor):
@@ -104,11 +109,15 @@ def export_exotics(exotics: set):
     return str(set([export_tensor(f) for f in exotics])).replace('"', "")
 
 
+def export_effective_operator(eff_op: EffectiveOperator):
+    op = export_operator(eff_op.operator)
+    return f"EffectiveOperator(name='{eff_op.name}', operator={op})"
+
+
 def export_completion(c: Completion, lazy=True):
 
     name = c.operator.name
-    op = export_operator(c.operator.operator)
-    eff_op = f"EffectiveOperator(name='{name}', operator={op})"
+    eff_op = export_effective_operator(c.operator)
 
     graph = export_graph(c.graph)
     part = export_partition(c.partition)
@@ -138,3 +147,41 @@ def export_completion(c: Completion, lazy=True):
     export_string = f"""LazyCompletion(head={head}, tail="{completion_string}")"""
 
     return export_string if lazy else completion_string
+
+
+def export_partition_data(data: dict) -> Dict[str, str]:
+    """Returns the partition dictionary produced by
+    `neutrinomass.completions.partitions` with each value exported as a string.
+
+    """
+    epsilons = ", ".join(export_tensor(e) for e in data["epsilons"])
+    return {
+        "operator": export_effective_operator(data["operator"]),
+        "partition": export_partition(data["partition"]),
+        "epsilons": f"[{epsilons}]",
+        "graph": export_graph(data["graph"].to_networkx()),
+        "topology": data["topology"],
+    }
+
+
+def import_string(string: str):
+    """Evaluates an exported string in the namespace used to read the model
+    database.
+
+    """
+    from neutrinomass.database import database
+
+    return eval(string, vars(database))
+
+
+def import_partition_data(data: Dict[str, str]) -> dict:
+    """Inverse of `export_partition_data`."""
+    out = {k: import_string(v) for k, v in data.items() if k != "topology"}
+    out["graph"] = PartitionGraph.from_networkx(out["graph"])
+    out["topology"] = data["topology"]
+    return out
+
+
+def import_completion(string: str) -> Completion:
+    """Inverse of `export_completion` with ``lazy=False``."""
+    return import_string(string)
@@ -69,3 +69,16 @@ def test_lazy_completion():
     op = DERIV_EFF_OPERATORS["D3"]
     comp = list(operator_completions(op))[0]
     lazy_comp = eval(export_completion(comp, lazy=True))
+
+
+def test_export_partition_data():
+    from neutrinomass.completions.completions import partitions
+
+    for data in partitions(EFF_OPERATORS["3b"])[:5]:
+        new = import_partition_data(export_partition_data(data))
+
+        assert new["partition"] == data["partition"]
+        assert new["epsilons"] == data["epsilons"]
+        assert new["graph"].to_networkx()._adj == data["graph"].to_networkx()._adj
+        assert new["operator"].operator == data["operator"].operator
+        assert new["topology"] == data["topology"]
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+
+"""Canonical forms of products of fields, epsilons and deltas.
+
+A product of tensors is read as a labelled contraction graph: each tensor is a
+vertex labelled by its head, and each dummy index is an edge between two
+slots. `canonical_contraction` returns a key that is the same for products
+equal up to
+
+    - relabelling of dummy indices,
+    - reordering of the tensors (with a sign for anticommuting fields),
+    - permutations of (anti)symmetric slots of the same index type,
+
+along with the sign relating the product to the form the key describes. A
+sign of zero means the product vanishes by symmetry. The key is found by
+backtracking over the choices of tensor and slot order, keeping the
+lexicographically smallest encoding.
+
+Only symmetries generated by (signed) transpositions of slots are handled.
+Anything else, or a search that runs over its budget, gives None so that the
+caller can fall back on sympy.
+
+"""
+
+from itertools import permutations
+from typing import Dict, List, Optional, Tuple
+
+import sympy.tensor.tensor as tensor
+
+# maximum number of partial encodings visited before giving up
+MAX_NODES = 20000
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _slot_groups(t: tensor.Tensor) -> List[Tuple[Tuple[int, ...], int]]:
+    """Returns the groups of slots of ``t`` that are symmetric (sign 1) or
+    antisymmetric (sign -1) under permutations, split by index type.
+
+    """
+    n = len(t.indices)
+    parent = list(range(n))
+    signs = {}
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for generator in t.component.symmetry.generators:
+        image = generator.array_form
+        moved = [i for i in range(n) if image[i] != i]
+        if not moved and image[n] == n:
+            continue
+        if len(moved) != 2 or image[moved[0]] != moved[1]:
+            raise _Unsupported(t)
+
+        sign = -1 if image[n] == n + 1 else 1
+        i, j = map(find, moved)
+        group_signs = {signs.get(i, sign), signs.get(j, sign), sign}
+        if len(group_signs) > 1:
+            raise _Unsupported(t)
+
+        parent[i] = j
+        signs[j] = sign
+
+    groups = {}
+    index_types = t.component.index_types
+    for i in range(n):
+        root = find(i)
+        groups.setdefault((root, index_types[i].name), []).append(i)
+
+    return [
+        (tuple(slots), signs.get(root, 1))
+        for (root, _), slots in groups.items()
+        if len(slots) > 1
+    ]
+
+
+def _permutation_sign(perm: List[int]) -> int:
+    sign, seen = 1, set()
+    for start in range(len(perm)):
+        if start in seen:
+            continue
+        length, i = 0, start
+        while i not in seen:
+            seen.add(i)
+            i = perm[i]
+            length += 1
+        if length % 2 == 0:
+            sign = -sign
+    return sign
+
+
+def canonical_contraction(
+    tensors: List[tensor.Tensor], relabel_free: bool = False
+) -> Optional[Tuple[tuple, int]]:
+    """Returns ``(key, sign)`` such that products of ``tensors`` with the same key
+    are equal up to their signs, and ``sign`` is 0 if the product vanishes.
+    Returns None if the product can't be canonicalised, see module docstring.
+
+    With ``relabel_free``, products with the same key are also equal up to
+    relabelling their free indices. The sign is then not meaningful.
+
+    """
+    try:
+        return _canonical_contraction(tensors, relabel_free)
+    except _Unsupported:
+        return None
+
+
+def _canonical_contraction(tensors, relabel_free):
+    n_tensors = len(tensors)
+    heads, groups, slots, fermions = [], [], [], []
+    comms = [t.component.comm for t in tensors]
+    for t, comm in zip(tensors, comms):
+        # invariant symbols come last so they refer to numbered dummies
+        is_structure = not hasattr(t, "charges")
+        heads.append(
+            (
+                is_structure,
+                t.component.name,
+                tuple(i.name for i in t.component.index_types),
+                comm,
+                tuple(tuple(g.array_form) for g in t.component.symmetry.generators),
+            )
+        )
+        groups.append(_slot_groups(t))
+        slots.append(
+            [(str(i.name), bool(i.is_up), i.tensor_index_type.name) for i in t.indices]
+        )
+        fermions.append(tensor.TensorManager.get_comm(comm, comm) == 1)
+
+    # only handle commuting and anticommuting fields
+    for c1, f1 in zip(comms, fermions):
+        for c2, f2 in zip(comms, fermions):
+            if tensor.TensorManager.get_comm(c1, c2) != int(f1 and f2):
+                raise _Unsupported(tensors)
+
+    # pair up the dummy indices
+    positions: Dict[str, List[Tuple[int, int]]] = {}
+    for n, t_slots in enumerate(slots):
+        for s, (name, *_) in enumerate(t_slots):
+            positions.setdefault(name, []).append((n, s))
+
+    partner = {}
+    for name, pos in positions.items():
+        if len(pos) > 2:
+            raise _Unsupported(tensors)
+        if len(pos) == 2:
+            (t1, s1), (t2, s2) = pos
+            if slots[t1][s1][1] == slots[t2][s2][1]:
+                raise _Unsupported(tensors)
+            partner[pos[0]], partner[pos[1]] = pos[1], pos[0]
+
+    sorted_heads = sorted(heads)
+
+    best: List[tuple] = []
+    best_signs = set()
+    numbering: Dict[Tuple[int, int], int] = {}
+    used = [False] * n_tensors
+    chosen: List[int] = []
+    encoding: List[tuple] = []
+    n_nodes = [0]
+
+    def code(n, s):
+        if (n, s) in partner:
+            number = numbering.get((n, s), numbering.get(partner[(n, s)]))
+            if number is not None:
+                return (1, number, slots[n][s][1])
+            return None
+        name, is_up, index_type = slots[n][s]
+        return (0, index_type if relabel_free else name, is_up)
+
+    def arrangements(n):
+        """Yields the encodings of tensor ``n`` over the arrangements of its
+        symmetric slots, with the new dummies in each order, along with the
+        slots given new numbers and the sign of the arrangement.
+
+        """
+        t_slots = list(range(len(slots[n])))
+        options = [[(t_slots, 1)]]
+        for group, sign in groups[n]:
+            fixed = sorted(
+                (s for s in group if code(n, s) is not None), key=lambda s: code(n, s)
+            )
+            new = [s for s in group if code(n, s) is None]
+            group_options = []
+            for perm in set(permutations(new)):
+                arranged = fixed + list(perm)
+                positions = [group.index(s) for s in arranged]
+                perm_sign = _permutation_sign(positions) if sign == -1 else 1
+                group_options.append((group, arranged, perm_sign))
+            options.append(group_options)
+
+        def combine(k, arrangement, sign):
+            if k == len(options):
+                yield arrangement, sign
+                return
+            for group, arranged, perm_sign in options[k]:
+                new_arrangement = list(arrangement)
+                for position, s in zip(group, arranged):
+                    new_arrangement[position] = s
+                yield from combine(k + 1, new_arrangement, sign * perm_sign)
+
+        for arrangement, sign in combine(1, t_slots, 1):
+            new_numbers = {}
+            codes = []
+            for s in arrangement:
+                c = code(n, s)
+                if c is None:
+                    number = new_numbers.get(partner[(n, s)])
+                    if number is None:
+                        number = len(numbering) + len(new_numbers)
+                        new_numbers[(n, s)] = number
+                    c = (1, number, slots[n][s][1])
+                codes.append(c)
+            yield tuple(codes), new_numbers, sign
+
+    def search(k, sign):
+        n_nodes[0] += 1
+        if n_nodes[0] > MAX_NODES:
+            raise _Unsupported(tensors)
+
+        if k == n_tensors:
+            # sign from reordering the anticommuting fields
+            fermion_order = [n for n in chosen if fermions[n]]
+            ranks = {n: r for r, n in enumerate(sorted(fermion_order))}
+            total = sign * _permutation_sign([ranks[n] for n in fermion_order])
+            if encoding < best or not best:
+                best[:] = encoding
+                best_signs.clear()
+            best_signs.add(total)
+            return
+
+        for n in range(n_tensors):
+            if used[n] or heads[n] != sorted_heads[k]:
+                continue
+
+            for codes, new_numbers, arrangement_sign in arrangements(n):
+                encoding.append((sorted_heads[k], codes))
+                if not best or encoding <= best[: k + 1]:
+                    used[n] = True
+                    chosen.append(n)
+                    numbering.update(new_numbers)
+                    search(k + 1, sign * arrangement_sign)
+                    for key in new_numbers:
+                        del numbering[key]
+                    chosen.pop()
+                    used[n] = False
+                encoding.pop()
+
+    search(0, 1)
+    sign = 0 if len(best_signs) > 1 else best_signs.pop()
+    return tuple(best), sign
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+
+from neutrinomass.tensormethod.canonical import *
+from neutrinomass.tensormethod.core import IndexedField, eps, delta
+from neutrinomass.tensormethod.sm import L, H, Q
+
+import sympy.tensor.tensor as tensor
+
+
+def form(op):
+    return canonical_contraction([t for t in op.args if isinstance(t, tensor.Tensor)])
+
+
+def test_canonical_contraction():
+    op = L("u0 i0") * L("u1 i1") * H("i2") * H("i3")
+    op *= eps("-i0 -i2") * eps("-i1 -i3") * eps("-u0 -u1")
+
+    # relabelled and reordered
+    other = H("i3") * H("i2") * L("u1 i0") * L("u0 i1")
+    other *= eps("-i1 -i2") * eps("-u1 -u0") * eps("-i0 -i3")
+
+    (key, sign), (other_key, other_sign) = form(op), form(other)
+    assert key == other_key
+    assert sign * other_sign * op.sympy_simplify() == other.sympy_simplify()
+
+    # free indices are kept
+    free = L("u0 i0") * L("u1 i1") * H("i2") * H("i3")
+    free *= eps("-i0 -i2") * eps("-u0 -u1")
+    assert form(free)[0] != key
+
+
+def test_vanishing_contractions():
+    # antisymmetric contraction of symmetric indices
+    op = L("u0 i0") * L("u1 i1") * H("i2") * H("i3")
+    op *= eps("-i0 -i1") * eps("-i2 -i3") * eps("-u0 -u1")
+    assert form(op)[1] == 0 and op.simplify() == 0
+
+    X = IndexedField("X", "c0 c1")
+    assert form(X * eps("-c0 -c1 -c2"))[1] == 0
+
+    assert form(Q("u0 c0 i0") * delta("c1 -c0") * eps("-u0 -u1"))[1] != 0
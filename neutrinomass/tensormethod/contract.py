@@ -5,14 +5,16 @@
 """
 
 import itertools
-from functools import reduce
+from functools import lru_cache, reduce
 from itertools import permutations
 from itertools import product
 from typing import List
 from typing import Tuple
 from typing import Union
 
-from neutrinomass.utils import chunks
+import sympy.tensor.tensor as tensor
+
+from neutrinomass.tensormethod.canonical import canonical_contraction
 from neutrinomass.tensormethod.core import Field
 from neutrinomass.tensormethod.core import Index
 from neutrinomass.tensormethod.core import IndexedField
@@ -88,10 +90,49 @@ def colour_singlets(operators: List[Operator], overcomplete=False):
     return result
 
 
+@lru_cache(maxsize=None)
+def pairings(n: int) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    """Returns the (2k - 1)!! ways of pairing up ``n = 2k`` positions.
+
+    Example:
+        >>> pairings(4)
+        (((0, 1), (2, 3)), ((0, 2), (1, 3)), ((0, 3), (1, 2)))
+
+    """
+    if n == 0:
+        return ((),)
+
+    out = []
+    for partner in range(1, n):
+        # relabel the remaining positions onto 0, ..., n - 3
+        rest = [i for i in range(1, n) if i != partner]
+        for pairing in pairings(n - 2):
+            out.append(((0, partner),) + tuple((rest[i], rest[j]) for i, j in pairing))
+
+    return tuple(out)
+
+
+@lru_cache(maxsize=None)
+def partial_pairings(
+    n_short: int, n_long: int, n_pairs: int
+) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    """Returns the ways of pairing the first ``n_pairs`` of ``n_short`` positions
+    with distinct positions out of ``n_long``, as ``(long, short)`` pairs.
+
+    """
+    assert n_pairs <= n_short <= n_long
+    return tuple(
+        tuple(zip(long_positions, range(n_pairs)))
+        for long_positions in permutations(range(n_long), n_pairs)
+    )
+
+
 def epsilon_combos(indices):
-    mapper = lambda x: frozenset(map(frozenset, chunks(x, 2)))
-    sets = set(map(mapper, permutations(indices)))
-    return sets
+    """Returns the ways of contracting ``indices`` in pairs with epsilons."""
+    return [
+        tuple((indices[i], indices[j]) for i, j in pairing)
+        for pairing in pairings(len(indices))
+    ]
 
 
 def su2_singlets_type(op: Operator, index_type: str) -> List[Operator]:
@@ -168,17 +209,16 @@ def contract_su2_helper(
 
     # get different epsilon combinations
     shortest, longest = sorted([left_indices, right_indices], key=len)
-    eps_index_combos = [tuple(zip(perm, shortest)) for perm in permutations(longest)]
+    n_pairs = (n_input_indices - n_target_indices) // 2
+    if n_pairs > len(shortest):
+        return []
 
     results = []
-    for combo in eps_index_combos:
+    for combo in partial_pairings(len(shortest), len(longest), n_pairs):
         prod = 1
-        counter = n_input_indices
         for i, j in combo:
-            prod *= eps(" ".join([(-i).label, (-j).label]))
-            counter -= 2
-            if counter == n_target_indices:
-                results.append(prod)
+            prod *= eps(" ".join([(-longest[i]).label, (-shortest[j]).label]))
+        results.append(prod)
 
     return results
 
@@ -253,8 +293,7 @@ def unsimplified_invariants(*fields, ignore=[]) -> List[Operator]:
     all.
 
     """
-    prod = decompose_product(*fields)
-    singlets = [i for i in prod if i.is_singlet]
+    singlets = decompose_product(*fields, singlets_only=True)
 
     if not singlets:
         return []
@@ -381,30 +420,44 @@ def clean_operators(operators):
     return out
 
 
-def remove_relabellings(operators):
-    """Remove operators related by index relabellings.
+def relabelling_key(op: Operator):
+    """Returns a key equal for operators related by relabelling indices (free and
+    dummy) and reordering fields, for all index types at once. Returns None if
+    the operator can't be put in canonical form, see
+    `neutrinomass.tensormethod.canonical`.
+
+    """
+    tensors = [t for t in op.args if isinstance(t, tensor.Tensor)]
+    form = canonical_contraction(tensors, relabel_free=True)
+    return None if form is None else form[0]
 
-        Note:
-            Currently only works for SU(2) isospin structure, since mistakenly
-            thinks
 
-            (L^i L^k) (L^j eb) H^l eps(ij) eps(kl)
-                            and
-            (L^i L^j) (L^k eb) H^l eps(ij) eps(kl)
+def remove_relabellings(operators):
+    """Remove operators related by index relabellings.
 
-        are the same since they can be related by interchanging j and k.
+    Operators are compared by `relabelling_key` in a single pass. The few that
+    have no key are compared pairwise by their isospin structures with
+    `compare_singlets`.
 
     """
-    to_remove = set()
-    counter = 0
-    for i in range(len(operators)):
-        for j in range(i + 1, len(operators)):
-            mappings = compare_singlets(operators[i], operators[j])
+    seen, unkeyed, out = set(), [], []
+    for op in operators:
+        key = relabelling_key(op)
+        if key is None:
+            if any(
+                exists_identity_mapping(compare_singlets(kept, op), kept)
+                for kept in unkeyed
+            ):
+                continue
+            unkeyed.append(op)
+        elif key in seen:
+            continue
+        else:
+            seen.add(key)
 
-            if exists_identity_mapping(mappings, operators[i]):
-                to_remove.add(j)
+        out.append(op)
 
-    return [op for i, op in enumerate(operators) if i not in to_remove]
+    return out
 
 
 def invariants(*fields, ignore=["u", "d", "c"], remove_relabellings_=True):
@@ -417,16 +470,6 @@ def invariants(*fields, ignore=["u", "d", "c"], remove_relabellings_=True):
         [L(u0, I_0)*L(u1, I_1)*Q(u2, c0, I_2)*Eps(-I_0, -I_2)*db(u3, -c1)*H(I_3)*Eps(-I_3, -I_1),
          L(u0, I_0)*L(u1, I_1)*Eps(-I_1, -I_0)*Q(u2, c0, I_2)*db(u3, -c1)*H(I_3)*Eps(-I_3, -I_2)]
 
-    Note:
-        Currently only works for SU(2) isospin structure, since
-        ``remove_relabellings`` mistakenly thinks
-
-            (L^i L^k) (L^j eb) H^l eps(ij) eps(kl)
-                            and
-            (L^i L^j) (L^k eb) H^l eps(ij) eps(kl)
-
-        are the same since they can be related by interchanging j and k.
-
     """
     singlets = unsimplified_invariants(*fields, ignore=ignore)
     clean_singlets = clean_operators(singlets)
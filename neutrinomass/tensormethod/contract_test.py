@@ -11,6 +11,9 @@ from neutrinomass.tensormethod.contract import is_identity_mapping
 from neutrinomass.tensormethod.contract import clean_operators
 from neutrinomass.tensormethod.contract import remove_relabellings
 from neutrinomass.tensormethod.contract import invariants
+from neutrinomass.tensormethod.contract import pairings
+from neutrinomass.tensormethod.contract import partial_pairings
+from neutrinomass.tensormethod.contract import contract_su2_helper
 from neutrinomass.tensormethod.sm import *
 
 
@@ -63,6 +66,17 @@ def test_extract_relabellings():
     assert extract_relabellings(a, b) == [relabellings1, relabellings2]
 
 
+def test_pairings():
+    assert [len(pairings(n)) for n in (0, 2, 4, 6, 8)] == [1, 1, 3, 15, 105]
+    for pairing in pairings(6):
+        assert sorted(i for pair in pairing for i in pair) == list(range(6))
+    assert len(set(map(frozenset, pairings(6)))) == 15
+
+    # ordered choices of 2 out of 3 partners for the first 2 positions
+    assert len(partial_pairings(2, 3, 2)) == 6
+    assert contract_su2_helper(L("u0 i0"), L("u1 i1"), 0, "i") == [eps("-i1 -i0")]
+
+
 def test_compare_singlets():
     pass
 
@@ -76,7 +90,16 @@ def test_clean_operators():
 
 
 def test_remove_relabellings():
-    pass
+    fields = L("u0 i0") * L("u1 i1") * L("u2 i2") * eb("u3") * H("i3")
+    op1 = fields * eps("-i0 -i2") * eps("-i1 -i3")
+    op2 = fields * eps("-i0 -i1") * eps("-i2 -i3")
+
+    # related by swapping u1 and u2
+    assert remove_relabellings([op1, op2]) == [op1]
+
+    # not once the Lorentz indices are contracted
+    lorentz = eps("-u0 -u1") * eps("-u2 -u3")
+    assert len(remove_relabellings([op1 * lorentz, op2 * lorentz])) == 2
 
 
 def test_invariants():
@@ -1,10 +1,16 @@
 #!/usr/bin/env python
 
 
-from collections import defaultdict
+import os
+import pickle
+import re
+import weakref
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 from copy import copy, deepcopy
 from itertools import groupby
 from string import ascii_lowercase
+from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import NamedTuple
@@ -13,11 +19,13 @@ from typing import Union
 from functools import reduce
 
 import sympy.tensor.tensor as tensor
-from basisgen import irrep
 from sympy import flatten, Rational
 from sympy.core.numbers import Zero
 
+from neutrinomass.tensormethod import irreps
+from neutrinomass.tensormethod.canonical import canonical_contraction
 from neutrinomass.tensormethod.lnv import BL_LIST
+from neutrinomass.utils.functions import stage_timer
 from neutrinomass.tensormethod.utils import (
     repr_tree,
     to_tex,
@@ -67,6 +75,71 @@ UNDOTTED = tensor.TensorIndexType("Undotted", metric=True, dummy_fmt="U", dim=2)
 DOTTED = tensor.TensorIndexType("Dotted", metric=True, dummy_fmt="D", dim=2)
 
 
+class IndexAllocator:
+    """Hands out fresh index labels like ``i3_`` from plain counters, one for
+    each index type. The labels only depend on the calls made to the
+    allocator, not on the history of the process.
+
+    """
+
+    def __init__(self, counters: Dict[str, int] = None):
+        self.counters = dict(counters) if counters else {}
+
+    def fresh(self, type_: str) -> str:
+        n = self.counters.get(type_, 0)
+        self.counters[type_] = n + 1
+        return f"{type_}{n}_"
+
+    @property
+    def state(self) -> tuple:
+        return tuple(sorted(self.counters.items()))
+
+    @state.setter
+    def state(self, state: tuple):
+        self.counters = dict(state)
+
+    @classmethod
+    def after(cls, indices: Iterable["Index"]) -> "IndexAllocator":
+        """An allocator whose labels don't clash with the fresh labels in
+        ``indices``.
+
+        """
+        counters = {}
+        for idx in indices:
+            match = re.fullmatch(r"-?([a-z])(\d+)_", str(idx))
+            if match:
+                type_, n = match.group(1), int(match.group(2))
+                counters[type_] = max(counters.get(type_, 0), n + 1)
+
+        return cls(counters)
+
+
+# the innermost allocator is used by `Index.fresh`, see `index_scope`
+_INDEX_ALLOCATORS = [IndexAllocator()]
+
+
+def current_index_allocator() -> IndexAllocator:
+    return _INDEX_ALLOCATORS[-1]
+
+
+@contextmanager
+def index_scope(allocator: IndexAllocator):
+    """Context manager making `Index.fresh` take labels from ``allocator``.
+
+    On exit the enclosing allocator is moved past the labels handed out, so
+    fresh indices made afterwards don't clash with them.
+
+    """
+    _INDEX_ALLOCATORS.append(allocator)
+    try:
+        yield allocator
+    finally:
+        _INDEX_ALLOCATORS.pop()
+        outer = current_index_allocator().counters
+        for type_, n in allocator.counters.items():
+            outer[type_] = max(outer.get(type_, 0), n)
+
+
 class Index(tensor.TensorIndex):
     """A tensor index."""
 
@@ -167,13 +240,11 @@ class Index(tensor.TensorIndex):
 
     @classmethod
     def fresh(cls, type_) -> "Index":
-        """Return a fresh, unused index by mutating a global counter internal to sympy's
-        tensor module.
+        """Return a fresh, unused index from the current `IndexAllocator` (see
+        `index_scope`).
 
         """
-        idx = cls(tensor.TensorIndex(True, cls.get_tensor_index_types()[type_]))
-        label = idx.label.replace("i", type_)
-        return cls(label)
+        return cls(current_index_allocator().fresh(type_))
 
     @classmethod
     def fresh_indices(cls, dynkin_str) -> str:
@@ -229,6 +300,87 @@ class Index(tensor.TensorIndex):
         return {"label": self.label}
 
 
+class Charges(dict):
+    """A read-only dictionary of charges. Fields cache their hash, so charges
+    can't be changed in place: assign a new dictionary to ``field.charges``
+    instead.
+
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(
+            "Charges are immutable, assign a new dict to the field's charges instead."
+        )
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+def _freeze(data):
+    """Hashable version of nested dictionaries and lists."""
+    if isinstance(data, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in data.items()))
+    if isinstance(data, (list, tuple)):
+        return tuple(_freeze(x) for x in data)
+    return data
+
+
+# interned field keys, see `FieldKey`
+_FIELD_KEYS = weakref.WeakValueDictionary()
+
+
+class FieldKey:
+    """The immutable data identifying a `Field`, interned so that equal fields
+    share one key. Keys are then compared by identity and their hash is
+    computed once.
+
+    """
+
+    __slots__ = ("data", "hash", "__weakref__")
+
+    def __new__(cls, data: tuple):
+        key = _FIELD_KEYS.get(data)
+        if key is None:
+            key = super().__new__(cls)
+            key.data = data
+            key.hash = hash(data)
+            _FIELD_KEYS[data] = key
+        return key
+
+    def __hash__(self):
+        return self.hash
+
+    def __reduce__(self):
+        return (self.__class__, (self.data,))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"FieldKey({self.data})"
+
+
+# attributes making up a field's key
+_KEY_ATTRS = frozenset(
+    (
+        "label",
+        "dynkin",
+        "charges",
+        "is_conj",
+        "comm",
+        "symmetry",
+        "nf",
+        "derivs",
+        "stripped",
+    )
+)
+
+
 class Field:
     def __init__(
         self,
@@ -309,14 +461,47 @@ class Field:
         self.derivs = derivs
         self.stripped = stripped
 
+    def __setattr__(self, name, value):
+        # keep the key and dynkin digits in sync with the attributes
+        if name in _KEY_ATTRS:
+            if name == "charges":
+                value = Charges(value)
+            elif name == "dynkin":
+                self.__dict__["_dynkin_ints"] = tuple(int(i) for i in value)
+            self.__dict__.pop("_key", None)
+        object.__setattr__(self, name, value)
+
+    @property
+    def key(self) -> FieldKey:
+        """The interned `FieldKey` of the field, cached until one of its
+        attributes is set.
+
+        """
+        key = self.__dict__.get("_key")
+        if key is None:
+            key = FieldKey(
+                (
+                    self.label,
+                    self._dynkin_ints,
+                    _freeze(self.charges),
+                    self.is_conj,
+                    self.comm,
+                    _freeze(self.symmetry),
+                    self.nf,
+                    self.derivs,
+                    _freeze(self.stripped),
+                )
+            )
+            self.__dict__["_key"] = key
+        return key
+
     def __call__(self, indices: str) -> "IndexedField":
         """Returns an IndexedField object.
 
         Indices must match dynkin structure.
 
         """
-        dynkin_ints = [int(i) for i in self.dynkin]
-        su2_plus, su2_minus, su3_up, su3_down, su2 = dynkin_ints
+        su2_plus, su2_minus, su3_up, su3_down, su2 = self._dynkin_ints
         index_types = (
             [UNDOTTED] * su2_plus
             + [DOTTED] * su2_minus
@@ -372,15 +557,15 @@ class Field:
 
     @property
     def dynkin_ints(self):
-        return tuple([int(i) for i in self.dynkin])
+        return self._dynkin_ints
 
     @property
     def lorentz_irrep(self):
-        return self.dynkin_ints[:2]
+        return self._dynkin_ints[:2]
 
     @property
     def sm_irrep(self):
-        return self.dynkin_ints[2:]
+        return self._dynkin_ints[2:]
 
     @property
     def colour_irrep(self):
@@ -453,28 +638,31 @@ class Field:
         }
 
     def __hash__(self):
-        unhashable = "charges", "symmetry", "stripped"
-        values = [v for k, v in self._dict.items() if not k in unhashable]
-
-        # constructe hashable structures for each unhashable
-        symmetry_tuple = tuple(map(tuple, self._dict["symmetry"]))
-        charges_tuple = tuple(self.charges.items())
-
-        data = tuple(values) + (symmetry_tuple,) + (charges_tuple,)
-        return hash(data)
+        return self.key.hash
 
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return False
-        return self._dict == other._dict
+        return self.key is other.key
 
     def __mul__(self, other):
-        grp = "SU2 x SU2 x SU3 x SU2"
-        self_irrep = irrep(grp, " ".join(self.dynkin))
-        other_irrep = irrep(grp, " ".join(other.dynkin))
+        return self.multiply(other)
+
+    def multiply(self, other, remaining=None) -> List["Field"]:
+        """Returns the irreps in the product of ``self`` and ``other``. If the
+        ``remaining`` fields of a product are given, only the irreps that could
+        still form a singlet with them are kept, see `can_form_singlet`.
 
-        # basisgen returns a dict-like object: irrep -> multiplicity
-        prod_dict = self_irrep * other_irrep
+        """
+        # highest weights and multiplicities, memoised on the dynkin digits
+        product = irrep_product(self._dynkin_ints, other._dynkin_ints)
+        if remaining is not None:
+            y = self.y + other.y
+            product = [
+                (hw, n) for hw, n in product if can_form_singlet(hw, y, remaining)
+            ]
+            if not product:
+                return []
 
         # make sure charges are consistent
         assert self.charges.keys() == other.charges.keys()
@@ -489,12 +677,12 @@ class Field:
         irreps = [
             Field(
                 self.label_with_dagger + other.label_with_dagger,
-                k.highest_weight.components,
+                highest_weight,
                 charges=charges,
                 history=new_hist,
-                multiplicity=v,
+                multiplicity=multiplicity,
             )
-            for k, v in prod_dict.items()
+            for highest_weight, multiplicity in product
         ]
         return irreps
 
@@ -903,6 +1091,14 @@ class IndexedField(tensor.Tensor, Field):
         return field(indices)
 
 
+# results of `Operator.simplify` by canonical form, with the sign and
+# coefficient of the operator simplified, least recently used first. The
+# canonical form includes the names of the free indices and sympy renames the
+# dummies, so the results don't depend on the indices of the operator cached.
+_SIMPLIFIED: "OrderedDict[tuple, tuple]" = OrderedDict()
+MAX_SIMPLIFIED = 100000
+
+
 class Operator(tensor.TensMul):
     def __new__(cls, *args, **kwargs):
         return super(Operator, cls).__new__(cls, *args, **kwargs)
@@ -1028,10 +1224,46 @@ class Operator(tensor.TensMul):
         return self.nocoeff if not isinstance(self, Zero) else 0
 
     def simplify(self, fill=False):
-        if fill:
-            simple = self.fill_free_indices().sorted_components().canon_bp()
+        """Returns the operator in canonical form, or 0 if it vanishes.
+
+        Operators are first put in the canonical form of
+        `neutrinomass.tensormethod.canonical`, which spots operators that vanish
+        by symmetry. sympy's canonicalisation is then only run once per form,
+        the result is scaled for equivalent operators. These have the same free
+        indices and differ only in their dummies, which sympy relabels.
+
+        """
+        op = self.fill_free_indices() if fill else self
+        canonical = canonical_contraction(
+            [t for t in op.args if isinstance(t, tensor.Tensor)]
+        )
+        if canonical is None:
+            return op.sympy_simplify()
+
+        key, sign = canonical
+        if not sign:
+            return 0
+
+        factor = sign * op.coeff
+        cached = _SIMPLIFIED.get(key)
+        if cached is None:
+            if len(_SIMPLIFIED) >= MAX_SIMPLIFIED:
+                _SIMPLIFIED.popitem(last=False)
+            cached = _SIMPLIFIED[key] = (op.sympy_simplify(), factor)
         else:
-            simple = self.sorted_components().canon_bp()
+            _SIMPLIFIED.move_to_end(key)
+
+        simple, cached_factor = cached
+        if simple == 0 or factor == cached_factor:
+            return simple
+        return simple * (factor / cached_factor)
+
+    def sympy_simplify(self):
+        """Canonicalises the operator with sympy's `canon_bp`, contracting the
+        SU(2) metrics.
+
+        """
+        simple = self.sorted_components().canon_bp()
 
         for label, tensor_index_type in Index.get_tensor_index_types().items():
             if label in {"u", "d", "i"}:
@@ -1042,6 +1274,7 @@ class Operator(tensor.TensMul):
 
         return simple.canon_bp()
 
+    @stage_timer("safe_simplify")
     def safe_simplify(self):
         try:
             return self.simplify()
@@ -1234,10 +1467,85 @@ def get_dynkin(indices: Union[str, Iterable[Index]]):
     return "".join(str(x) for x in flat_dynkin)
 
 
-# @lru_cache(maxsize=None)
-def decompose_product(*fields) -> List[Field]:
+# products of irreps of SU2 x SU2 x SU3 x SU2 keyed on pairs of dynkin tuples,
+# see `irrep_product`
+_IRREP_PRODUCTS: Dict[tuple, Tuple[Tuple[Tuple[int, ...], int], ...]] = {}
+
+
+def irrep_product(
+    dynkin_1: Tuple[int, ...], dynkin_2: Tuple[int, ...]
+) -> Tuple[Tuple[Tuple[int, ...], int], ...]:
+    """Returns the highest weights and multiplicities of the irreps in the product
+    of the irreps of SU2 x SU2 x SU3 x SU2 with dynkin digits ``dynkin_1`` and
+    ``dynkin_2``, from `neutrinomass.tensormethod.irreps`. Products are memoised,
+    see also `save_irrep_products`.
+
+    Example:
+        >>> irrep_product((1, 0, 0, 0, 1), (0, 0, 1, 0, 1))
+        (((1, 0, 1, 0, 2), 1), ((1, 0, 1, 0, 0), 1))
+
+    """
+    key = (tuple(dynkin_1), tuple(dynkin_2))
+    product = _IRREP_PRODUCTS.get(key)
+    if product is None:
+        product = irreps.irrep_product(*key)
+        _IRREP_PRODUCTS[key] = product
+
+    return product
+
+
+def save_irrep_products(path: str) -> None:
+    """Writes the memoised irrep products to ``path``."""
+    with open(path, "wb") as f:
+        pickle.dump(_IRREP_PRODUCTS, f)
+
+
+def load_irrep_products(path: str) -> None:
+    """Adds the irrep products saved at ``path`` to those memoised, if the file
+    exists.
+
+    """
+    if not os.path.exists(path):
+        return
+
+    with open(path, "rb") as f:
+        _IRREP_PRODUCTS.update(pickle.load(f))
+
+
+def can_form_singlet(dynkin: Tuple[int, ...], y, fields: List[Field]) -> bool:
+    """Returns False if an irrep with dynkin digits ``dynkin`` and hypercharge
+    ``y`` can't form a singlet with ``fields``, i.e. its conjugate is not in the
+    product of the fields.
+
+    The bounds are necessary, not sufficient: the hypercharges must cancel, an
+    SU(2) label must be reachable by the Clebsch-Gordan series of the fields'
+    labels and the conjugate SU(3) irrep must be dominated by the sum of the
+    fields' highest weights.
+
+    """
+    if y + sum(f.y for f in fields) != 0:
+        return False
+
+    dynkins = [f._dynkin_ints for f in fields]
+    for i in (0, 1, 4):
+        labels = [d[i] for d in dynkins]
+        total, lowest = sum(labels), 2 * max(labels, default=0) - sum(labels)
+        if (dynkin[i] + total) % 2 or not lowest <= dynkin[i] <= total:
+            return False
+
+    # highest weight of the product minus the conjugate as simple roots
+    p, q = dynkin[2:4]
+    dp, dq = sum(d[2] for d in dynkins) - q, sum(d[3] for d in dynkins) - p
+    a, b = 2 * dp + dq, dp + 2 * dq
+    return a >= 0 and b >= 0 and a % 3 == 0 and b % 3 == 0
+
+
+def decompose_product(*fields, singlets_only=False) -> List[Field]:
     """Decompose product of Fields.
 
+    With ``singlets_only``, only the singlets are returned and irreps that can't
+    form a singlet with the remaining fields are dropped at each step.
+
     Example:
         >>> decompose_product(A, B, A.conj)
         >>> [ABA†(23003)(1/6), ABA†(23001)(1/6), ABA†(21003)(1/6), ...]
@@ -1245,14 +1553,19 @@ def decompose_product(*fields) -> List[Field]:
     """
 
     if len(fields) == 1:
+        if singlets_only:
+            return [f for f in fields if f.is_singlet]
         return fields[0]
 
-    if len(fields) == 2:
-        fst, snd = fields
-        return fst * snd
-
     fst, snd, *rst = fields
-    result = map(lambda x: decompose_product(x, *rst), fst * snd)
+    irreps = fst.multiply(snd, remaining=rst if singlets_only else None)
+
+    if not rst:
+        return irreps
+
+    result = map(
+        lambda x: decompose_product(x, *rst, singlets_only=singlets_only), irreps
+    )
     return flatten(result)
 
 
@@ -114,3 +114,101 @@ def test_strip_derivs():
     assert D(D(H, "11"), "00")("i0").strip_derivs_with_indices() == H("i0")
 
     assert D(Q, "01").strip_derivs_with_indices().derivs == 0
+
+
+def test_index_allocator():
+    allocator = IndexAllocator.after(IndexedField("E", "u3_ -c1_ i0 g2_").indices)
+    assert allocator.counters == {"u": 4, "c": 2, "g": 3}
+
+    with index_scope(allocator):
+        assert str(Index.fresh("u")) == "u4_"
+        assert str(Index.fresh("i")) == "i0_"
+        assert A.fresh_indices().indices == IndexedField("A", "u5_ -c2_ i1_").indices
+
+    # the same scope gives the same labels
+    with index_scope(IndexAllocator(dict(u=4))):
+        assert str(Index.fresh("u")) == "u4_"
+
+    # labels made outside don't clash with those handed out in a scope
+    assert current_index_allocator().counters["u"] >= 6
+
+
+def test_field_key():
+    import pickle
+    import pytest
+
+    other = Field("A", dynkin="10011", charges={"y": 1})
+    assert other.key is A.key
+    assert hash(other) == hash(A) and other == A
+    assert A.dynkin_ints == (1, 0, 0, 1, 1)
+
+    # keys follow attributes, charges are only set as a whole
+    other.charges = {**other.charges, "l": 1}
+    assert other.key is not A.key and other != A
+    with pytest.raises(TypeError):
+        other.charges["l"] = 0
+
+    assert pickle.loads(pickle.dumps(A)) == A
+
+
+def test_irrep_product(tmp_path):
+    from neutrinomass.tensormethod import core
+
+    product = irrep_product((1, 0, 0, 0, 1), (0, 0, 1, 0, 1))
+    assert product == (((1, 0, 1, 0, 2), 1), ((1, 0, 1, 0, 0), 1))
+    assert [f.dynkin for f in A * A.conj] == [
+        "".join(map(str, hw))
+        for hw, _ in irrep_product(A.dynkin_ints, A.conj.dynkin_ints)
+    ]
+
+    path = str(tmp_path / "products.p")
+    save_irrep_products(path)
+    saved = dict(core._IRREP_PRODUCTS)
+    core._IRREP_PRODUCTS.clear()
+    load_irrep_products(path)
+    assert core._IRREP_PRODUCTS == saved
+
+
+def test_singlets_only():
+    from neutrinomass.tensormethod.sm import L, Q, db, H
+
+    fields = L, L, Q, db, H, H, H.conj
+    singlets = [f for f in decompose_product(*fields) if f.is_singlet]
+    assert decompose_product(*fields, singlets_only=True) == singlets
+    assert [f.walked() for f in singlets] == [
+        f.walked() for f in decompose_product(*fields, singlets_only=True)
+    ]
+
+    assert can_form_singlet(L.dynkin_ints, -L.y, [L])
+    assert not can_form_singlet(L.dynkin_ints, L.y, [L])
+    assert not can_form_singlet(L.conj.dynkin_ints, -L.y, [L])
+    assert not can_form_singlet((0, 0, 0, 0, 4), 0, [H, H.conj])
+
+
+def test_simplify_cache(monkeypatch):
+    from neutrinomass.tensormethod import core
+    from neutrinomass.tensormethod.sm import L, H
+
+    monkeypatch.setattr(core, "_SIMPLIFIED", core.OrderedDict())
+    monkeypatch.setattr(core, "MAX_SIMPLIFIED", 2)
+
+    # same canonical form, different dummies and sign
+    a = L("u0 i0") * L("u1 i1") * H("i2") * H("i3")
+    a *= eps("-i0 -i2") * eps("-i1 -i3") * eps("-u0 -u1")
+    b = L("u5 i7") * L("u4 i6") * H("i9") * H("i8")
+    b *= eps("-i6 -i8") * eps("-i7 -i9") * eps("-u4 -u5")
+    c = L("u0 i0") * H("i1") * eps("-i0 -i1")
+
+    assert a.simplify() == a.sympy_simplify()
+    assert len(core._SIMPLIFIED) == 1
+    # the cached result of a is relabelled and rescaled for b
+    assert b.simplify() == b.sympy_simplify() == -a.simplify()
+    assert len(core._SIMPLIFIED) == 1
+
+    # the least recently used form, that of c, is dropped when full
+    c.simplify()
+    a.simplify()
+    key_a = list(core._SIMPLIFIED)[-1]
+    (L("u0 i0") * L("u1 i1") * eps("-u0 -u1") * eps("-i0 -i1")).simplify()
+    assert len(core._SIMPLIFIED) == 2
+    assert key_a in core._SIMPLIFIED
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+"""Tensor products of irreps of SU2 x SU2 x SU3 x SU2 (Lorentz x SM) on integer
+dynkin digits, without building weight systems.
+
+The SU(2) products follow the Clebsch-Gordan series and the SU(3) products the
+Littlewood-Richardson rule on Young diagrams with at most three rows. Used by
+`neutrinomass.tensormethod.core.irrep_product` in place of basisgen, which is
+kept in `basisgen_irrep_product` to check against.
+
+Example:
+    $ python -m neutrinomass.tensormethod.irreps
+
+prints a comparison with basisgen on products of the Standard Model fields.
+
+"""
+
+from collections import Counter
+from itertools import product
+from typing import Dict, Tuple
+
+Dynkin = Tuple[int, ...]
+
+
+def su2_product(a: int, b: int) -> Dict[Tuple[int], int]:
+    """Clebsch-Gordan series: the irreps with dynkin digits ``a`` and ``b``
+    multiply to those with ``a + b``, ``a + b - 2``, ..., ``|a - b|``.
+
+    """
+    return {(c,): 1 for c in range(a + b, abs(a - b) - 1, -2)}
+
+
+def su3_product(dynkin_1: Dynkin, dynkin_2: Dynkin) -> Dict[Tuple[int, int], int]:
+    """Multiplies SU(3) irreps by the Littlewood-Richardson rule.
+
+    The Young diagram of ``dynkin_1`` has rows ``(p + q, q)``. The boxes of the
+    first (second) row of the diagram of ``dynkin_2`` are added to it as a
+    horizontal strip of 1s (2s) such that the 2s, read right to left and top to
+    bottom, never outnumber the 1s. Rows that would make a fourth row are
+    dropped and full columns are removed.
+
+    """
+    p1, q1 = dynkin_1
+    p2, q2 = dynkin_2
+    lam = (p1 + q1, q1, 0)
+    mu1, mu2 = p2 + q2, q2
+
+    out = Counter()
+    for a1 in range(min(mu1, lam[0] - lam[1]) + 1):
+        for a2 in range(min(mu1 - a1, lam[1] - lam[2]) + 1):
+            # the 1s not in the second or third rows go in the first
+            a0 = mu1 - a1 - a2
+            # lattice word: the 2s can't outnumber the 1s above them
+            if mu2 > a0 + a1:
+                continue
+            nu = (lam[0] + a0, lam[1] + a1, lam[2] + a2)
+            for b2 in range(min(mu2, nu[1] - nu[2]) + 1):
+                b1 = mu2 - b2
+                # horizontal strip and lattice word conditions
+                if b1 > nu[0] - nu[1] or b1 > a0:
+                    continue
+                rows = (nu[0], nu[1] + b1, nu[2] + b2)
+                out[(rows[0] - rows[1], rows[1] - rows[2])] += 1
+
+    return dict(out)
+
+
+def irrep_product(dynkin_1: Dynkin, dynkin_2: Dynkin) -> Tuple[Tuple[Dynkin, int], ...]:
+    """Returns the highest weights and multiplicities of the irreps in the
+    product of irreps of SU2 x SU2 x SU3 x SU2 with dynkin digits ``dynkin_1``
+    and ``dynkin_2``, ordered from the highest weight down.
+
+    Example:
+        >>> irrep_product((1, 0, 0, 0, 1), (0, 0, 1, 0, 1))
+        (((1, 0, 1, 0, 2), 1), ((1, 0, 1, 0, 0), 1))
+
+    """
+    u1, d1, c1, cb1, i1 = dynkin_1
+    u2, d2, c2, cb2, i2 = dynkin_2
+    factors = (
+        su2_product(u1, u2),
+        su2_product(d1, d2),
+        su3_product((c1, cb1), (c2, cb2)),
+        su2_product(i1, i2),
+    )
+
+    out = {}
+    for irreps in product(*(f.items() for f in factors)):
+        highest_weight = sum((hw for hw, _ in irreps), ())
+        multiplicity = 1
+        for _, n in irreps:
+            multiplicity *= n
+        out[highest_weight] = multiplicity
+
+    return tuple(sorted(out.items(), reverse=True))
+
+
+def basisgen_irrep_product(
+    dynkin_1: Dynkin, dynkin_2: Dynkin
+) -> Tuple[Tuple[Dynkin, int], ...]:
+    """Same as `irrep_product` but computed with basisgen."""
+    from basisgen import irrep
+
+    grp = "SU2 x SU2 x SU3 x SU2"
+    self_irrep = irrep(grp, " ".join(map(str, dynkin_1)))
+    other_irrep = irrep(grp, " ".join(map(str, dynkin_2)))
+
+    # basisgen returns a dict-like object: irrep -> multiplicity
+    out = {
+        tuple(k.highest_weight.components): v
+        for k, v in (self_irrep * other_irrep).items()
+    }
+    return tuple(sorted(out.items(), reverse=True))
+
+
+def benchmark(number: int = 100) -> None:
+    """Checks the products of all pairs of Standard Model fields (and their
+    conjugates) against basisgen and prints the time taken by each.
+
+    """
+    import timeit
+    from neutrinomass.tensormethod import sm
+
+    fields = [sm.L, sm.Q, sm.eb, sm.ub, sm.db, sm.H, sm.G, sm.W, sm.B]
+    fields += [f.conj for f in fields]
+    pairs = [(f.dynkin_ints, g.dynkin_ints) for f in fields for g in fields]
+
+    for pair in pairs:
+        assert irrep_product(*pair) == basisgen_irrep_product(*pair), pair
+
+    for name, func in [("basisgen", basisgen_irrep_product), ("native", irrep_product)]:
+        time = timeit.timeit(lambda: [func(*p) for p in pairs], number=number)
+        print(f"{name}: {time / number * 1e3:.2f} ms for {len(pairs)} products")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+
+from itertools import product
+
+from neutrinomass.tensormethod.irreps import *
+
+
+def test_su2_product():
+    assert su2_product(1, 1) == {(2,): 1, (0,): 1}
+    assert su2_product(2, 3) == {(5,): 1, (3,): 1, (1,): 1}
+
+
+def test_su3_product():
+    # 3 x 3b = 8 + 1, 8 x 8 = 27 + 10 + 10b + 2(8) + 1
+    assert su3_product((1, 0), (0, 1)) == {(1, 1): 1, (0, 0): 1}
+    assert su3_product((1, 1), (1, 1)) == {
+        (2, 2): 1,
+        (3, 0): 1,
+        (0, 3): 1,
+        (1, 1): 2,
+        (0, 0): 1,
+    }
+
+
+def test_irrep_product():
+    dynkins = list(product(range(2), repeat=5))
+    for dynkin_1 in dynkins:
+        for dynkin_2 in [(1, 0, 0, 0, 1), (0, 1, 1, 1, 2), (1, 1, 0, 2, 0)]:
+            assert irrep_product(dynkin_1, dynkin_2) == basisgen_irrep_product(
+                dynkin_1, dynkin_2
+            )
@@ -35,12 +35,12 @@ def make_coupling(symbol: str, indices: str, sym=None):
 
 
 def npoint_fieldstrings(n, fields=(L, eb, Q, db, ub, H), derivs=False, func=None):
-    L.charges["l"] = 1
-    eb.charges["l"] = -1
-    Q.charges["l"] = 0
-    ub.charges["l"] = 0
-    db.charges["l"] = 0
-    H.charges["l"] = 0
+    L.charges = {**L.charges, "l": 1}
+    eb.charges = {**eb.charges, "l": -1}
+    Q.charges = {**Q.charges, "l": 0}
+    ub.charges = {**ub.charges, "l": 0}
+    db.charges = {**db.charges, "l": 0}
+    H.charges = {**H.charges, "l": 0}
 
     conjs = tuple([f.conj for f in fields])
     if derivs:
@@ -58,8 +58,7 @@ def npoint_fieldstrings(n, fields=(L, eb, Q, db, ub, H), derivs=False, func=None
                     bar()
                     continue
 
-            prods = decompose_product(*combo)
-            singlets = [i for i in prods if i.is_singlet]
+            singlets = decompose_product(*combo, singlets_only=True)
             if singlets:
                 terms += [singlets[0]]
             bar()
@@ -39,11 +39,11 @@ Wb.latex = r"\bar{W}"
 Bb.latex = r"\bar{B}"
 
 # Add baryon number
-L.charges["3b"] = 0
-Q.charges["3b"] = 1
-H.charges["3b"] = 0
-eb.charges["3b"] = 0
-ub.charges["3b"] = -1
-db.charges["3b"] = -1
+L.charges = {**L.charges, "3b": 0}
+Q.charges = {**Q.charges, "3b": 1}
+H.charges = {**H.charges, "3b": 0}
+eb.charges = {**eb.charges, "3b": 0}
+ub.charges = {**ub.charges, "3b": -1}
+db.charges = {**db.charges, "3b": -1}
 
 LNV_OPERATORS = {tuple([eval(field) for field in k]): v for k, v in BL_LIST.items()}
@@ -12,12 +12,12 @@ from neutrinomass.tensormethod.core import Field, Operator, Prod, decompose_prod
 
 
 # add lepton number
-L.charges["L"] = 1
-Q.charges["L"] = 0
-H.charges["L"] = 0
-ub.charges["L"] = 0
-db.charges["L"] = 0
-eb.charges["L"] = -1
+L.charges = {**L.charges, "L": 1}
+Q.charges = {**Q.charges, "L": 0}
+H.charges = {**H.charges, "L": 0}
+ub.charges = {**ub.charges, "L": 0}
+db.charges = {**db.charges, "L": 0}
+eb.charges = {**eb.charges, "L": -1}
 
 SM = [L, Q, H, eb, ub, db]
 FIELDS = SM + [f.conj for f in SM]
@@ -49,9 +49,9 @@ def generate_operators(
     for n_fields in range(2, max_dim + 1):
         combos = combinations_with_replacement(fields, n_fields)
         for combo in combos:
-            products = decompose_product(*combo)
+            products = decompose_product(*combo, singlets_only=True)
             for prod in products:
-                if prod.is_singlet and prod_mass_dim(prod.walked()) <= max_dim:
+                if prod_mass_dim(prod.walked()) <= max_dim:
                     if verbose:
                         print(prod)
                     out.append(prod)
@@ -1,4 +1,4 @@
 #!/usr/bin/env python3
 
-from .functions import chunks, timeit, remove_equivalent
+from .functions import chunks, timeit, remove_equivalent, stage_timer, stage_times
 from .match import pmatch
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
 import time
-from typing import List, Callable, TypeVar, Set
+from contextlib import contextmanager
+from functools import wraps
+from typing import List, Callable, TypeVar, Set, Dict
 
 T = TypeVar("T")
 
@@ -31,6 +33,58 @@ def timeit(method):
     return timed
 
 
+# stack of dictionaries the functions decorated with `stage_timer` add their
+# times to, see `stage_times`
+_STAGE_TIMES = []
+
+
+def stage_timer(name: str):
+    """Decorator adding the wall time of the function to the stage ``name`` in
+    the innermost active `stage_times`. Does nothing when none are active.
+    Recursive calls are only timed once.
+
+    """
+
+    def decorator(method):
+        depth = [0]
+
+        @wraps(method)
+        def timed(*args, **kw):
+            if not _STAGE_TIMES or depth[0]:
+                return method(*args, **kw)
+
+            depth[0] += 1
+            ts = time.perf_counter()
+            try:
+                return method(*args, **kw)
+            finally:
+                depth[0] -= 1
+                times = _STAGE_TIMES[-1]
+                times[name] = times.get(name, 0.0) + time.perf_counter() - ts
+
+        return timed
+
+    return decorator
+
+
+@contextmanager
+def stage_times(times: Dict[str, float] = None):
+    """Context manager collecting the times of the functions decorated with
+    `stage_timer` into ``times`` (a new dictionary if not passed in).
+
+        with stage_times() as times:
+            ...
+        print(times["safe_simplify"])
+
+    """
+    times = {} if times is None else times
+    _STAGE_TIMES.append(times)
+    try:
+        yield times
+    finally:
+        _STAGE_TIMES.pop()
+
+
 def remove_equivalent(
     l: List[T], eq_func: Callable[[T, T], bool], verbose: bool = False
 ) -> None: